@@ -2,7 +2,9 @@
 import json
 import os
 import re
-from typing import Any, Dict
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -16,6 +18,25 @@ load_dotenv()
 
 logger = get_logger(__name__)
 
+# 结构化提取提示词中的通用要求（第 1 条由调用方根据输出格式给出）
+_EXTRACTION_RULES = (
+    "2. 如果某个字段在文本中找不到，根据字段类型设置为null或空字符串\n"
+    "3. 日期字段请转换为标准格式（YYYY-MM-DD）\n"
+    "4. 数字字段请提取纯数字，去除货币符号等\n"
+    "5. 对于识别错误的文本，尝试通过上下文和模式匹配来推断正确值\n"
+    "6. 如果文本混乱，尝试查找关键词附近的数值或文本\n"
+    "7. 确保输出的JSON是有效的"
+)
+
+# OCR 结果带有文本块信息时追加的提示
+_POSITION_HINT = "注意：文本块的位置信息可以帮助你更准确地定位字段。"
+
+# 批量提取时估算每页输出 token：每个字段约为字段名长度的 2 倍，再加字段值与 JSON 标点的开销
+_BATCH_TOKENS_PER_FIELD = 24
+_BATCH_TOKENS_PER_PAGE = 8
+# 只使用 max_tokens 的一部分，给估算误差留余量，避免输出的 JSON 被截断
+_BATCH_OUTPUT_BUDGET_RATIO = 0.8
+
 
 class MockChatModel:
     """简易的 Mock 模型，用于本地测试"""
@@ -145,26 +166,12 @@ class LLMService:
         Returns:
             提取后的结构化数据字典
         """
-        # 构建字段提取提示
-        fields_info = []
-        for item in structure_config.get("items", []):
-            field_name = item.get("field", "")
-            description = item.get("description", "")
-            field_type = item.get("type", "text")
-            pattern = item.get("pattern", "")
-            
-            field_desc = f"- 字段名: {field_name}\n  描述: {description}\n  类型: {field_type}"
-            if pattern:
-                field_desc += f"\n  正则模式: {pattern}"
-            fields_info.append(field_desc)
-        
-        fields_text = "\n".join(fields_info)
+        fields_text = self._build_fields_text(structure_config)
         
         # 构建位置信息（如果有）
         position_context = ""
-        if ocr_result and "text_blocks" in ocr_result:
-            # 提取一些关键位置信息作为上下文
-            position_context = "\n\n注意：文本块的位置信息可以帮助你更准确地定位字段。"
+        if self._has_text_blocks(ocr_result):
+            position_context = "\n\n" + _POSITION_HINT
         
         prompt = (
             f"你是一个专业的OCR数据结构化提取专家。"
@@ -179,26 +186,12 @@ class LLMService:
         )
         
         # 添加字段示例
-        field_examples = []
-        for item in structure_config.get("items", []):
-            field_name = item.get("field", "")
-            field_type = item.get("type", "text")
-            if field_type in ["date", "number", "小数"]:
-                field_examples.append(f'  "{field_name}": null  // 如果未找到则设为null')
-            else:
-                field_examples.append(f'  "{field_name}": ""  // 如果未找到则设为空字符串')
-        
-        prompt += "\n" + ",\n".join(field_examples) + "\n"
+        prompt += "\n" + self._build_field_examples(structure_config) + "\n"
         prompt += (
             "}\n\n"
             "要求：\n"
             "1. 只输出JSON对象，不要添加任何解释或代码块标记\n"
-            "2. 如果某个字段在文本中找不到，根据字段类型设置为null或空字符串\n"
-            "3. 日期字段请转换为标准格式（YYYY-MM-DD）\n"
-            "4. 数字字段请提取纯数字，去除货币符号等\n"
-            "5. 对于识别错误的文本，尝试通过上下文和模式匹配来推断正确值\n"
-            "6. 如果文本混乱，尝试查找关键词附近的数值或文本\n"
-            "7. 确保输出的JSON是有效的"
+            + _EXTRACTION_RULES
         )
         
         result_text = self.generate_text(prompt)
@@ -208,16 +201,124 @@ class LLMService:
             logger.warning(f"LLM结构化提取返回不是合法JSON - Provider: {self.provider}", 
                           extra={"context": {"provider": self.provider, "result_preview": result_text[:200]}})
             # 返回空结构
-            result = {}
-            for item in structure_config.get("items", []):
-                field_name = item.get("field", "")
-                result[field_name] = None
-            return result
+            return self._empty_structure(structure_config)
         
         extracted_count = sum(1 for v in parsed.values() if v is not None and v != "")
         logger.debug(f"结构化数据提取成功 - Provider: {self.provider}, 已提取字段: {extracted_count}/{len(structure_config.get('items', []))}")
         return parsed
 
+    def improve_json_structure_batch(
+        self,
+        ocr_texts: List[str],
+        structure_config: Dict[str, Any],
+        ocr_results: List[Dict[str, Any]] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        在一次 LLM 请求中对多页 OCR 文本提取结构化数据
+        
+        Args:
+            ocr_texts: 每页的 OCR 文本
+            structure_config: 结构化配置文件（包含要提取的字段定义）
+            ocr_results: 与 ocr_texts 对应的完整OCR结果（可选，用于提供位置信息等上下文）
+        
+        Returns:
+            与 ocr_texts 一一对应的结构化数据字典列表
+        
+        Raises:
+            ValueError: LLM 返回的内容不是按段编号 "1".."n" 组织的 JSON 对象
+        """
+        if not ocr_texts:
+            return []
+        
+        page_count = len(ocr_texts)
+        fields_text = self._build_fields_text(structure_config)
+        page_sections = []
+        for idx, text in enumerate(ocr_texts):
+            section = f"【第 {idx + 1} 段】\n```\n{text}\n```"
+            if ocr_results and self._has_text_blocks(ocr_results[idx]):
+                section += f"\n{_POSITION_HINT}"
+            page_sections.append(section)
+        pages_text = "\n".join(page_sections)
+        
+        prompt = (
+            f"你是一个专业的OCR数据结构化提取专家。"
+            f"请根据以下字段定义，分别从下面 {page_count} 段OCR识别的文本中提取结构化数据。\n\n"
+            f"文档类型: {structure_config.get('title', '未知')}\n"
+            f"文档描述: {structure_config.get('description', '')}\n\n"
+            f"需要提取的字段：\n{fields_text}\n\n"
+            f"OCR识别文本（可能包含识别错误、乱码或格式混乱，请尽力理解并提取）：\n{pages_text}\n\n"
+            f"请输出一个JSON对象，键为文本段编号（字符串 \"1\" 到 \"{page_count}\"），"
+            f"值为对应文本段的提取结果，每个值格式如下：\n"
+            f"{{\n{self._build_field_examples(structure_config)}\n}}\n\n"
+            "要求：\n"
+            "1. 只输出JSON对象，不要添加任何解释或代码块标记，每个文本段编号都必须出现\n"
+            + _EXTRACTION_RULES
+        )
+        
+        result_text = self.generate_text(prompt)
+        parsed = self._safe_parse_json(result_text)
+        
+        page_keys = [str(idx + 1) for idx in range(page_count)]
+        if not isinstance(parsed, dict) or not all(isinstance(parsed.get(key), dict) for key in page_keys):
+            logger.warning(f"LLM批量结构化提取返回格式不符 - Provider: {self.provider}, 期望页数: {page_count}", 
+                          extra={"context": {"provider": self.provider, "expected": page_count, "result_preview": result_text[:200]}})
+            raise ValueError(f"LLM 批量提取返回的不是以 1..{page_count} 为键的 JSON 对象")
+        
+        logger.debug(f"批量结构化数据提取成功 - Provider: {self.provider}, 页数: {page_count}")
+        return [parsed[key] for key in page_keys]
+
+    def max_batch_pages(self, structure_config: Dict[str, Any]) -> Optional[int]:
+        """
+        按 max_tokens 估算一次批量提取请求最多能容纳的页数
+        
+        每页输出一个完整的字段对象，页数过多时输出会超过 max_tokens 被截断，
+        导致整批失败后再逐页重试，反而增加请求量。未配置 max_tokens 时返回 None（不限制）。
+        """
+        max_tokens = self.service_config.get("max_tokens")
+        if not max_tokens:
+            return None
+        tokens_per_page = _BATCH_TOKENS_PER_PAGE + sum(
+            2 * len(item.get("field", "")) + _BATCH_TOKENS_PER_FIELD
+            for item in structure_config.get("items", [])
+        )
+        return max(1, int(max_tokens * _BATCH_OUTPUT_BUDGET_RATIO) // tokens_per_page)
+
+    def _has_text_blocks(self, ocr_result: Dict[str, Any] | None) -> bool:
+        """OCR 结果是否带有文本块（位置）信息"""
+        return bool(ocr_result) and "text_blocks" in ocr_result
+
+    def _build_fields_text(self, structure_config: Dict[str, Any]) -> str:
+        """构建字段定义说明"""
+        fields_info = []
+        for item in structure_config.get("items", []):
+            field_name = item.get("field", "")
+            description = item.get("description", "")
+            field_type = item.get("type", "text")
+            pattern = item.get("pattern", "")
+            
+            field_desc = f"- 字段名: {field_name}\n  描述: {description}\n  类型: {field_type}"
+            if pattern:
+                field_desc += f"\n  正则模式: {pattern}"
+            fields_info.append(field_desc)
+        
+        return "\n".join(fields_info)
+
+    def _build_field_examples(self, structure_config: Dict[str, Any]) -> str:
+        """构建输出 JSON 的字段示例"""
+        field_examples = []
+        for item in structure_config.get("items", []):
+            field_name = item.get("field", "")
+            field_type = item.get("type", "text")
+            if field_type in ["date", "number", "小数"]:
+                field_examples.append(f'  "{field_name}": null  // 如果未找到则设为null')
+            else:
+                field_examples.append(f'  "{field_name}": ""  // 如果未找到则设为空字符串')
+        return ",\n".join(field_examples)
+
+    def _empty_structure(self, structure_config: Dict[str, Any]) -> Dict[str, Any]:
+        """所有字段均为 None 的空结构"""
+        return {item.get("field", ""): None for item in structure_config.get("items", [])}
+
     def _load_reference_template(self) -> str:
         with open("configs/structures/template.json", "r", encoding="utf-8") as f:
             return f.read().strip()
@@ -245,7 +346,7 @@ class LLMService:
 
         return str(content).strip()
 
-    def _safe_parse_json(self, text: str) -> Dict[str, Any] | None:
+    def _safe_parse_json(self, text: str) -> Any:
         cleaned = self._strip_code_fences(text)
         if not cleaned:
             return None
@@ -279,6 +380,21 @@ class LLMService:
         return cleaned.strip()
 
 
+# 全局实例（延迟加载，按配置路径缓存）
+_llm_service_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _create_llm_service(config_path: str) -> LLMService:
+    return LLMService(config_path)
+
+
+def get_llm_service(config_path: str = "configs/llms/init.json") -> LLMService:
+    """获取全局 LLM 服务实例，避免每次请求重复初始化模型客户端"""
+    # 统一按位置参数调用，保证不同配置路径各自缓存；加锁避免并发首次调用时重复初始化
+    with _llm_service_lock:
+        return _create_llm_service(config_path)
+
 if __name__ == "__main__":
     service = LLMService()
     print(f"当前 LLM Provider: {service.provider}")
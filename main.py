@@ -11,13 +11,13 @@ from typing import List, Optional
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from PIL import Image
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from llm import LLMService
 from ocr import OCREngineManager, OCREngineType
 from pdf_processor import is_pdf, process_pdf
 from pre_preocess import pre_preocess_for_pytesseract, pre_preocess_for_google_vision
-from structure import structure_ocr_result
+from structure import structure_ocr_result, structure_ocr_batch
 from output_generator import generate_output_files
 from structure_config import clean_json_file, check_structure_config, update_structure_config
 from logging_config import get_logger, log_performance, log_exception
@@ -173,65 +173,78 @@ async def health_check():
     return {"status": "ok", "message": "服务运行正常"}
 
 
-async def process_single_image(
-    image_data: bytes,
-    is_pdf_file: bool = False,
-    page_number: Optional[int] = None,
-) -> dict:
-    """处理单张图片或 PDF 页面"""
+def _pdf_render_grayscale() -> bool:
+    """pytesseract 预处理只使用灰度图，此时 PDF 页面直接渲染为灰度；Google Vision 需要保留颜色"""
+    return OCREngineManager().current_engine == OCREngineType.PYTESSERACT
+
+
+async def _ocr_single_image(image_data: bytes | Image.Image) -> tuple[str, dict]:
+    """
+    对单张图片进行预处理和 OCR 识别，返回 (预处理后图片的 data URL, OCR 结果)
+    
+    image_data 可以是已解码的 PIL 图片（如 PDF 页面），此时跳过图片解码
+    """
+    # 初始化OCR引擎
+    ocr_engine = OCREngineManager()
+    engine_info = ocr_engine.get_current_engine_info()
+    logger.info(f"使用OCR引擎: {engine_info['current_engine']}", extra={"context": engine_info})
+    
+    # 预处理
+    with log_performance("图像预处理", logger, {"engine": engine_info['current_engine']}):
+        if ocr_engine.current_engine == OCREngineType.PYTESSERACT:
+            pre_processed_image = pre_preocess_for_pytesseract(image_data)
+            if pre_processed_image is None:
+                logger.error("图像预处理失败 (pytesseract)")
+                raise HTTPException(status_code=400, detail="预处理失败")
+            processed_bytes, processed_preview = _image_to_bytes_and_data_url(pre_processed_image)
+            input_bytes = processed_bytes
+        else:
+            pre_processed_image = pre_preocess_for_google_vision(image_data)
+            if pre_processed_image is None:
+                logger.error("图像预处理失败 (google vision)")
+                raise HTTPException(status_code=400, detail="预处理失败")
+            processed_bytes, processed_preview = _image_to_bytes_and_data_url(pre_processed_image)
+            # Google Vision 也使用预处理后的图片（倾斜校正后的），以提高识别准确率
+            input_bytes = processed_bytes
+    
+    # OCR 识别
+    with log_performance("OCR识别", logger, {"engine": engine_info['current_engine']}):
+        ocr_result = await ocr_engine.process_image_with_current_engine(input_bytes)
+        if ocr_result is None:
+            logger.error("OCR识别失败", extra={"context": {"engine": engine_info['current_engine']}})
+            raise HTTPException(status_code=400, detail="OCR识别失败")
+        
+        logger.info(
+            f"OCR识别完成 - 文本长度: {len(ocr_result.get('text', ''))}, 置信度: {ocr_result.get('confidence', 0):.2f}",
+            extra={"context": {"engine": engine_info['current_engine'], "confidence": ocr_result.get('confidence', 0)}}
+        )
+    
+    return processed_preview, ocr_result
+
+
+def _log_structure_coverage(structured_result: dict):
+    """记录结构化结果的字段覆盖率"""
+    coverage = structured_result.get('structured_data', {}).get('coverage', 0)
+    logger.info(
+        f"结构化处理完成 - 覆盖率: {coverage:.2f}%",
+        extra={"context": {"coverage": coverage}}
+    )
+
+
+async def process_single_image(image_data: bytes) -> dict:
+    """处理单张图片（PDF 页面由 process_pdf_pages 批量处理）"""
     context_info = {
-        "is_pdf": is_pdf_file,
-        "page_number": page_number,
+        "is_pdf": False,
         "image_size": len(image_data),
     }
     
     with log_performance("处理单张图片", logger, context_info):
-        # 初始化OCR引擎
-        ocr_engine = OCREngineManager()
-        engine_info = ocr_engine.get_current_engine_info()
-        logger.info(f"使用OCR引擎: {engine_info['current_engine']}", extra={"context": engine_info})
-        
-        # 预处理
-        with log_performance("图像预处理", logger, {"engine": engine_info['current_engine']}):
-            if ocr_engine.current_engine == OCREngineType.PYTESSERACT:
-                pre_processed_image = pre_preocess_for_pytesseract(image_data)
-                if pre_processed_image is None:
-                    logger.error("图像预处理失败 (pytesseract)")
-                    raise HTTPException(status_code=400, detail="预处理失败")
-                processed_bytes, processed_preview = _image_to_bytes_and_data_url(pre_processed_image)
-                input_bytes = processed_bytes
-            else:
-                pre_processed_image = pre_preocess_for_google_vision(image_data)
-                if pre_processed_image is None:
-                    logger.error("图像预处理失败 (google vision)")
-                    raise HTTPException(status_code=400, detail="预处理失败")
-                processed_bytes, processed_preview = _image_to_bytes_and_data_url(pre_processed_image)
-                # Google Vision 也使用预处理后的图片（倾斜校正后的），以提高识别准确率
-                input_bytes = processed_bytes
-        
-        # OCR 识别
-        with log_performance("OCR识别", logger, {"engine": engine_info['current_engine']}):
-            ocr_result = await ocr_engine.process_image_with_current_engine(input_bytes)
-            if ocr_result is None:
-                logger.error("OCR识别失败", extra={"context": {"engine": engine_info['current_engine']}})
-                raise HTTPException(status_code=400, detail="OCR识别失败")
-            
-            logger.info(
-                f"OCR识别完成 - 文本长度: {len(ocr_result.get('text', ''))}, 置信度: {ocr_result.get('confidence', 0):.2f}",
-                extra={"context": {"engine": engine_info['current_engine'], "confidence": ocr_result.get('confidence', 0)}}
-            )
+        processed_preview, ocr_result = await _ocr_single_image(image_data)
         
         # 结构化处理
         with log_performance("结构化处理", logger):
             structured_result = structure_ocr_result(ocr_result)
-            logger.info(
-                f"结构化处理完成 - 覆盖率: {structured_result.get('structured_data', {}).get('coverage', 0):.2f}%",
-                extra={"context": {"coverage": structured_result.get('structured_data', {}).get('coverage', 0)}}
-            )
-        
-        # 如果是 PDF 页面，添加页码信息
-        if is_pdf_file and page_number:
-            structured_result["page_number"] = page_number
+            _log_structure_coverage(structured_result)
         
         return {
             "pre_processed_image": processed_preview,
@@ -240,6 +253,49 @@ async def process_single_image(
         }
 
 
+async def process_pdf_pages(pdf_pages: List[dict]) -> List[dict]:
+    """
+    处理 PDF 的所有页面：逐页 OCR，再将多页文本合并成批次交给 LLM 结构化
+    
+    Args:
+        pdf_pages: process_pdf 返回的页面列表
+    
+    Returns:
+        与 pdf_pages 一一对应的处理结果，格式同 process_single_image
+    """
+    previews = []
+    ocr_results = []
+    for page_info in pdf_pages:
+        width, height = page_info["image"].size
+        context_info = {
+            "is_pdf": True,
+            "page_number": page_info["page_number"],
+            "image_size": f"{width}x{height}",
+        }
+        with log_performance("处理单张图片", logger, context_info):
+            processed_preview, ocr_result = await _ocr_single_image(page_info["image"])
+        previews.append(processed_preview)
+        ocr_results.append(ocr_result)
+    
+    # 结构化处理（多页合并请求 LLM）
+    with log_performance("批量结构化处理", logger, {"pages": len(ocr_results)}):
+        structured_results = structure_ocr_batch(ocr_results)
+    
+    results = []
+    for page_info, processed_preview, ocr_result, structured_result in zip(
+        pdf_pages, previews, ocr_results, structured_results
+    ):
+        _log_structure_coverage(structured_result)
+        if page_info["page_number"]:
+            structured_result["page_number"] = page_info["page_number"]
+        results.append({
+            "pre_processed_image": processed_preview,
+            "ocr_result": ocr_result,
+            "structured_result": structured_result,
+        })
+    return results
+
+
 @app.post("/ocr")
 async def ocr(file: UploadFile = File(...), save_files: bool = True):
     """
@@ -268,18 +324,11 @@ async def ocr(file: UploadFile = File(...), save_files: bool = True):
         try:
             with log_performance("PDF处理", logger, {"filename": filename, "save_files": save_files}):
                 # 使用300 DPI以提高识别质量（可根据需要调整，300-400 DPI通常效果较好）
-                pdf_pages = process_pdf(file_data, dpi=300)
+                pdf_pages = process_pdf(file_data, dpi=300, grayscale=_pdf_render_grayscale())
                 logger.info(f"PDF解析完成 - 总页数: {len(pdf_pages)}", extra={"context": {"total_pages": len(pdf_pages)}})
                 
-                results = []
-                for page_info in pdf_pages:
-                    page_result = await process_single_image(
-                        page_info["image_bytes"],
-                        is_pdf_file=True,
-                        page_number=page_info["page_number"],
-                    )
-                    results.append(page_result)
-                    
+                results = await process_pdf_pages(pdf_pages)
+                for page_info, page_result in zip(pdf_pages, results):
                     # 如果配置了保存文件
                     if save_files:
                         base_name = Path(filename).stem
@@ -369,15 +418,11 @@ async def batch_process(files: List[UploadFile] = File(...), save_files: bool =
                 if is_pdf(file_data) or file_ext == ".pdf":
                     # PDF 处理（使用300 DPI以提高识别质量）
                     with log_performance(f"批量PDF处理: {filename}", logger):
-                        pdf_pages = process_pdf(file_data, dpi=300)
+                        pdf_pages = process_pdf(file_data, dpi=300, grayscale=_pdf_render_grayscale())
                         logger.info(f"PDF解析完成 - {filename}, 页数: {len(pdf_pages)}")
                         
-                        for page_info in pdf_pages:
-                            page_result = await process_single_image(
-                                page_info["image_bytes"],
-                                is_pdf_file=True,
-                                page_number=page_info["page_number"],
-                            )
+                        page_results = await process_pdf_pages(pdf_pages)
+                        for page_info, page_result in zip(pdf_pages, page_results):
                             results.append({
                                 "filename": filename,
                                 "page": page_info["page_number"],
@@ -2,6 +2,8 @@
 NLP 实体识别模块：使用 spaCy 识别日期、金额、手机号等实体
 """
 import re
+import threading
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 try:
@@ -19,6 +21,28 @@ logger = get_logger(__name__)
 class EntityRecognizer:
     """实体识别器"""
     
+    # 正则在类加载时编译一次，避免每篇文档重复解析模式
+    # 日期格式：YYYY-MM-DD, YYYY/MM/DD, YYYY年MM月DD日
+    _DATE_PATTERNS = [
+        (re.compile(r"\d{4}[-/]\d{1,2}[-/]\d{1,2}"), "YYYY-MM-DD"),
+        (re.compile(r"\d{4}年\d{1,2}月\d{1,2}日"), "YYYY年MM月DD日"),
+        (re.compile(r"\d{1,2}[-/]\d{1,2}[-/]\d{4}"), "MM-DD-YYYY"),
+    ]
+    # 金额格式：￥123.45, ¥123.45, 123.45元, 123,456.78
+    _AMOUNT_PATTERNS = [
+        (re.compile(r"[￥¥]\s*\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?"), "货币符号"),
+        (re.compile(r"\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?\s*[元圆]"), "元"),
+        (re.compile(r"\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?"), "纯数字"),
+    ]
+    # 中国手机号：11位数字，以1开头
+    _PHONE_RE = re.compile(r"1[3-9]\d{9}")
+    # 本地部分/域名按 RFC 5321 限制长度（64/255），避免长串无 @ 文本上的二次回溯
+    _EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Z|a-z]{2,}\b")
+    # 18位身份证号
+    _ID_CARD_RE = re.compile(r"\d{17}[\dXx]")
+    # 发票号：XXX-数字格式
+    _INVOICE_RE = re.compile(r"[A-Za-z]{2,}-\d+")
+    
     def __init__(self, model_name: str = "zh_core_web_sm"):
         """
         初始化实体识别器
@@ -96,15 +120,8 @@ class EntityRecognizer:
         """使用正则表达式提取日期"""
         dates = []
         
-        # 日期格式：YYYY-MM-DD, YYYY/MM/DD, YYYY年MM月DD日
-        patterns = [
-            (r"\d{4}[-/]\d{1,2}[-/]\d{1,2}", "YYYY-MM-DD"),
-            (r"\d{4}年\d{1,2}月\d{1,2}日", "YYYY年MM月DD日"),
-            (r"\d{1,2}[-/]\d{1,2}[-/]\d{4}", "MM-DD-YYYY"),
-        ]
-        
-        for pattern, format_type in patterns:
-            for match in re.finditer(pattern, text):
+        for pattern, format_type in self._DATE_PATTERNS:
+            for match in pattern.finditer(text):
                 dates.append({
                     "text": match.group(),
                     "start": match.start(),
@@ -119,15 +136,8 @@ class EntityRecognizer:
         """使用正则表达式提取金额"""
         amounts = []
         
-        # 金额格式：￥123.45, ¥123.45, 123.45元, 123,456.78
-        patterns = [
-            (r"[￥¥]\s*\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?", "货币符号"),
-            (r"\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?\s*[元圆]", "元"),
-            (r"\d{1,3}(?:[,，]\d{3})*(?:\.\d{2})?", "纯数字"),
-        ]
-        
-        for pattern, format_type in patterns:
-            for match in re.finditer(pattern, text):
+        for pattern, format_type in self._AMOUNT_PATTERNS:
+            for match in pattern.finditer(text):
                 amounts.append({
                     "text": match.group(),
                     "start": match.start(),
@@ -142,9 +152,7 @@ class EntityRecognizer:
         """使用正则表达式提取手机号"""
         phone_numbers = []
         
-        # 中国手机号：11位数字，以1开头
-        pattern = r"1[3-9]\d{9}"
-        for match in re.finditer(pattern, text):
+        for match in self._PHONE_RE.finditer(text):
             phone_numbers.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -157,9 +165,10 @@ class EntityRecognizer:
     def _extract_emails_regex(self, text: str) -> List[Dict[str, Any]]:
         """使用正则表达式提取邮箱"""
         emails = []
+        if "@" not in text:
+            return emails
         
-        pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-        for match in re.finditer(pattern, text):
+        for match in self._EMAIL_RE.finditer(text):
             emails.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -174,8 +183,7 @@ class EntityRecognizer:
         ids = []
         
         # 18位身份证号
-        id_pattern = r"\d{17}[\dXx]"
-        for match in re.finditer(id_pattern, text):
+        for match in self._ID_CARD_RE.finditer(text):
             ids.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -184,8 +192,7 @@ class EntityRecognizer:
             })
         
         # 发票号：XXX-数字格式
-        invoice_pattern = r"[A-Za-z]{2,}-\d+"
-        for match in re.finditer(invoice_pattern, text):
+        for match in self._INVOICE_RE.finditer(text):
             ids.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -207,14 +214,18 @@ class EntityRecognizer:
         return unique
 
 
-# 全局实例（延迟加载）
-_recognizer: Optional[EntityRecognizer] = None
+# 全局实例（延迟加载，按模型名缓存）
+_recognizer_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _create_entity_recognizer(model_name: Optional[str]) -> EntityRecognizer:
+    return EntityRecognizer(model_name)
 
 
 def get_entity_recognizer(model_name: str = "zh_core_web_sm") -> EntityRecognizer:
     """获取全局实体识别器实例"""
-    global _recognizer
-    if _recognizer is None:
-        _recognizer = EntityRecognizer(model_name)
-    return _recognizer
-
+    # 统一按位置参数调用，保证 get_entity_recognizer() 与显式传默认值命中同一缓存项；
+    # 加锁避免并发首次调用时重复加载 spaCy 模型
+    with _recognizer_lock:
+        return _create_entity_recognizer(model_name)
@@ -7,6 +7,28 @@ import re
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+_ARROW_RE = re.compile(r"->|→")
+# correct_text_blocks 拼接文本块时使用的分隔符（ASCII 单元分隔符）
+_BLOCK_SEPARATOR = "\x1f"
+
+
+def _is_word_char(char: str) -> bool:
+    """与 re 模块中 \\w 的判定一致"""
+    return char.isalnum() or char == "_"
+
 
 class OCRPostProcessor:
     """OCR 后处理器，用于校正专业术语和常见错误"""
@@ -20,6 +42,8 @@ class OCRPostProcessor:
         """
         self.custom_words: Dict[str, str] = {}
         self.common_corrections: Dict[str, str] = {}
+        # 精确匹配用的自动机（或合并正则），词汇表变化后延迟重建
+        self._matcher: Any = None
         
         if custom_words_path:
             self.load_custom_words(custom_words_path)
@@ -39,23 +63,25 @@ class OCRPostProcessor:
             print(f"警告：自定义词汇表文件不存在: {words_path}")
             return
         
-        with open(words_file, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                # 跳过注释和空行
-                if not line or line.startswith("#"):
-                    continue
-                
-                # 支持格式：原词 -> 校正词 或 仅原词（原词作为校正词）
-                if "->" in line or "→" in line:
-                    parts = re.split(r"->|→", line, 1)
-                    if len(parts) == 2:
-                        original = parts[0].strip()
-                        corrected = parts[1].strip()
-                        self.custom_words[original] = corrected
-                else:
-                    # 仅原词，用于模糊匹配
-                    self.custom_words[line] = line
+        # 一次读入整个文件再按行切分，避免逐行读取解码
+        for line in words_file.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            # 跳过注释和空行
+            if not line or line.startswith("#"):
+                continue
+            
+            # 支持格式：原词 -> 校正词 或 仅原词（原词作为校正词）
+            if "->" in line or "→" in line:
+                parts = _ARROW_RE.split(line, 1)
+                if len(parts) == 2:
+                    original = parts[0].strip()
+                    corrected = parts[1].strip()
+                    self.custom_words[original] = corrected
+            else:
+                # 仅原词，用于模糊匹配
+                self.custom_words[line] = line
+        
+        self._matcher = None
 
     def _load_common_corrections(self) -> None:
         """加载常见 OCR 错误校正表"""
@@ -98,13 +124,8 @@ class OCRPostProcessor:
         Returns:
             校正后的文本
         """
-        corrected_text = text
-        
-        # 1. 精确匹配替换
-        for original, corrected in self.custom_words.items():
-            # 使用单词边界匹配，避免部分匹配
-            pattern = r'\b' + re.escape(original) + r'\b'
-            corrected_text = re.sub(pattern, corrected, corrected_text)
+        # 1. 精确匹配替换（单次扫描全部词汇，使用单词边界匹配，避免部分匹配）
+        corrected_text = self._exact_replace(text)
         
         # 2. 模糊匹配替换（如果启用）
         if use_fuzzy_match and self.custom_words:
@@ -118,6 +139,71 @@ class OCRPostProcessor:
         
         return corrected_text
 
+    def _build_matcher(self) -> Any:
+        """根据当前词汇表构建精确匹配器"""
+        words = {original: corrected for original, corrected in self.custom_words.items() if original}
+        if not words:
+            return None
+        
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for original, corrected in words.items():
+                automaton.add_word(original, (original, corrected))
+            automaton.make_automaton()
+            return automaton
+        
+        # 未安装 pyahocorasick 时合并为一个正则，长词优先
+        alternatives = sorted(words, key=len, reverse=True)
+        pattern = re.compile("|".join(r"\b" + re.escape(word) + r"\b" for word in alternatives))
+        return pattern, words
+
+    def _exact_replace(self, text: str) -> str:
+        """
+        在一次扫描中完成所有自定义词汇的精确替换
+        
+        同一位置有多个词匹配时取最靠左、最长的一个，替换结果不再参与后续匹配。
+        
+        Args:
+            text: 原始文本
+        
+        Returns:
+            替换后的文本
+        """
+        if self._matcher is None:
+            self._matcher = self._build_matcher()
+        if self._matcher is None or not text:
+            return text
+        
+        if not AHOCORASICK_AVAILABLE:
+            pattern, words = self._matcher
+            return pattern.sub(lambda match: words[match.group()], text)
+        
+        text_len = len(text)
+        matches = []
+        for end, (original, corrected) in self._matcher.iter(text):
+            start = end - len(original) + 1
+            # 模拟 \b：匹配两端与相邻字符的“单词字符”属性必须不同
+            before = start > 0 and _is_word_char(text[start - 1])
+            after = end + 1 < text_len and _is_word_char(text[end + 1])
+            if before == _is_word_char(original[0]) or after == _is_word_char(original[-1]):
+                continue
+            matches.append((start, end + 1, corrected))
+        
+        if not matches:
+            return text
+        
+        matches.sort(key=lambda item: (item[0], item[0] - item[1]))
+        pieces = []
+        position = 0
+        for start, end, corrected in matches:
+            if start < position:
+                continue
+            pieces.append(text[position:start])
+            pieces.append(corrected)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+
     def _fuzzy_replace(
         self, 
         text: str, 
@@ -133,12 +219,23 @@ class OCRPostProcessor:
         Returns:
             替换后的文本
         """
+        words = text.split()
+        
+        if RAPIDFUZZ_AVAILABLE:
+            # rapidfuzz 的相似度计算在 C++ 中完成；fuzz.ratio 为 0-100 的 Indel 相似度
+            custom_word_keys = list(self.custom_words.keys())
+            score_cutoff = threshold * 100
+            corrected_words = []
+            for word in words:
+                best = process.extractOne(word, custom_word_keys, scorer=fuzz.ratio, score_cutoff=score_cutoff)
+                corrected_words.append(self.custom_words[best[0]] if best else word)
+            return " ".join(corrected_words)
+        
         try:
             from difflib import SequenceMatcher
         except ImportError:
             return text
         
-        words = text.split()
         corrected_words = []
         
         for word in words:
@@ -171,15 +268,24 @@ class OCRPostProcessor:
         Returns:
             校正后的文本块列表
         """
-        corrected_blocks = []
-        for block in text_blocks:
-            corrected_block = block.copy()
-            if "text" in block:
-                corrected_block["text"] = self.correct_text(
-                    block["text"], 
-                    use_fuzzy_match=use_fuzzy_match
-                )
-            corrected_blocks.append(corrected_block)
+        corrected_blocks = [block.copy() for block in text_blocks]
+        text_block_list = [block for block in corrected_blocks if "text" in block]
+        if not text_block_list:
+            return corrected_blocks
+        
+        texts = [block["text"] for block in text_block_list]
+        if any(_BLOCK_SEPARATOR in text for text in texts):
+            # 文本本身含分隔符时无法安全拼接，逐块校正
+            corrected_texts = [self.correct_text(text, use_fuzzy_match=use_fuzzy_match) for text in texts]
+        else:
+            # 拼接后只做一次精确匹配扫描；分隔符不是单词字符，不影响单词边界判断
+            corrected_texts = self._exact_replace(_BLOCK_SEPARATOR.join(texts)).split(_BLOCK_SEPARATOR)
+            # 模糊匹配按空白分词，会吞掉分隔符，仍需逐块处理
+            if use_fuzzy_match and self.custom_words:
+                corrected_texts = [self._fuzzy_replace(text) for text in corrected_texts]
+        
+        for block, corrected_text in zip(text_block_list, corrected_texts):
+            block["text"] = corrected_text
         return corrected_blocks
 
     def add_custom_word(self, original: str, corrected: Optional[str] = None) -> None:
@@ -191,6 +297,7 @@ class OCRPostProcessor:
             corrected: 校正后的词汇（如果为None，则使用original）
         """
         self.custom_words[original] = corrected or original
+        self._matcher = None
 
     def get_correction_stats(self) -> Dict[str, int]:
         """
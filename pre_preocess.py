@@ -8,13 +8,19 @@ from logging_config import get_logger, log_performance
 logger = get_logger(__name__)
 
 
-def pre_preocess_for_pytesseract(image_data: bytes):
-    image = Image.open(io.BytesIO(image_data))
+def _open_image(image_data: bytes | Image.Image) -> Image.Image:
+    """已解码的图片（如 PDF 页面）直接使用，避免重复解码"""
+    if isinstance(image_data, Image.Image):
+        return image_data
+    return Image.open(io.BytesIO(image_data))
+
+def pre_preocess_for_pytesseract(image_data: bytes | Image.Image):
+    image = _open_image(image_data)
     image = preprocess_image(image)
     return image
 
-def pre_preocess_for_google_vision(image_data: bytes):
-    image = Image.open(io.BytesIO(image_data))
+def pre_preocess_for_google_vision(image_data: bytes | Image.Image):
+    image = _open_image(image_data)
     image = preprocess_image(image, preserve_color=True)
     return image
 
@@ -57,14 +63,25 @@ def preprocess_image(image: Image.Image, preserve_color: bool = False) -> Image.
         img_binary = cv2.morphologyEx(img_binary, cv2.MORPH_OPEN, kernel)
         
         # 7. 水印抑制（弱化浅色水印/盖章）
-        watermark_kernel = np.ones((5, 5), np.uint8)
-        watermark_layer = cv2.morphologyEx(img_binary, cv2.MORPH_CLOSE, watermark_kernel, iterations=1)
+        watermark_layer = _close_rect_separable(img_binary, 5)
         img_binary = cv2.bitwise_and(img_binary, watermark_layer)
         
         logger.debug("预处理完成（完整流程：倾斜校正、去噪、增强、二值化、水印抑制）")
         # 转换回PIL图像
         return Image.fromarray(img_binary)
 
+def _close_rect_separable(image: np.ndarray, size: int) -> np.ndarray:
+    """矩形结构元素的闭运算（可分离实现）
+
+    size×size 矩形膨胀/腐蚀等价于先做 size×1 再做 1×size，
+    每像素比较次数从 size² 降为 2·size，结果与稠密核闭运算一致。
+    注意不能写成两次一维闭运算，那样结果不同。
+    """
+    kernel_h = cv2.getStructuringElement(cv2.MORPH_RECT, (size, 1))
+    kernel_v = cv2.getStructuringElement(cv2.MORPH_RECT, (1, size))
+    dilated = cv2.dilate(cv2.dilate(image, kernel_h), kernel_v)
+    return cv2.erode(cv2.erode(dilated, kernel_h), kernel_v)
+
 def correct_skew(image: np.ndarray) -> np.ndarray:
     """自动检测并校正图片倾斜（支持±30°）"""
     try:
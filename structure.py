@@ -1,42 +1,152 @@
-import json
 import re
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
-from llm import LLMService
-from nlp_entity import get_entity_recognizer
 from schemas import FieldConfidence, StructuredData
 from logging_config import get_logger, log_performance, log_exception
+from structure_config import load_json_file
+
+if TYPE_CHECKING:
+    from llm import LLMService
+    from nlp_entity import EntityRecognizer
 
 logger = get_logger(__name__)
 
 
+# llm（LangChain 各 provider）与 nlp_entity（spaCy）导入耗时较长，
+# 延迟到首次真正需要时再导入；NLP 处理被禁用或文本为空时不会触发
+def get_llm_service() -> "LLMService":
+    """获取全局 LLM 服务实例（延迟导入 llm 模块）"""
+    from llm import get_llm_service as _get_llm_service
+    return _get_llm_service()
+
+
+def get_entity_recognizer() -> "EntityRecognizer":
+    """获取全局实体识别器实例（延迟导入 nlp_entity 模块）"""
+    from nlp_entity import get_entity_recognizer as _get_entity_recognizer
+    return _get_entity_recognizer()
+
+
+# 文本清理用到的正则（模块加载时编译一次）
+# 只匹配需要替换的空白（连续空格或含制表符），单个空格不产生替换
+_RE_SPACES = re.compile(r" [ \t]+|\t[ \t]*")
+# 纯 ASCII 长文本改用 numpy 按字节向量化折叠空白；短文本时 numpy 调用开销超过正则
+_ASCII_SPACES_MIN_LEN = 1024
+_RE_MANY_NEWLINES = re.compile(r"\n{3,}")
+_RE_SPECIAL_CHARS = re.compile(r"[^\w\s\u4e00-\u9fff，。、；：！？""''（）【】《》￥%]")
+# 纯 ASCII 文本（英文票据等）用 str.translate 删除特殊字符，比正则快一个数量级；
+# 含非 ASCII 字符时全量码表过大，仍走正则
+_SPECIAL_CHARS_ASCII_TABLE = {c: None for c in range(128) if _RE_SPECIAL_CHARS.match(chr(c))}
+
+
+def _collapse_ascii_spaces(text: str) -> str:
+    """将纯 ASCII 文本中的连续空格/制表符折叠为单个空格（结果与 _RE_SPACES.sub(" ", text) 一致）"""
+    data = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    is_space = (data == 0x20) | (data == 0x09)
+    # 保留非空白字符以及每段空白的第一个字符
+    keep = np.ones_like(is_space)
+    keep[1:] = ~(is_space[1:] & is_space[:-1])
+    collapsed = data[keep]
+    collapsed[is_space[keep]] = 0x20
+    return collapsed.tobytes().decode("ascii")
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Optional[re.Pattern]:
+    """编译并缓存结构化配置中的字段正则；非法正则缓存为 None，避免每次调用都重新编译失败"""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        logger.warning(f"结构化配置中的正则无效，已忽略: {pattern} ({e})", extra={"context": {"pattern": pattern}})
+        return None
+
+
 def _clean_text(text: str, cleaning_config: Dict[str, Any]) -> str:
     """根据配置清理文本"""
+    return _clean_text_cached(
+        text,
+        bool(cleaning_config.get("remove_extra_spaces", False)),
+        bool(cleaning_config.get("normalize_whitespace", False)),
+        bool(cleaning_config.get("remove_special_chars", False)),
+    )
+
+
+@lru_cache(maxsize=4)
+def _clean_text_cached(
+    text: str,
+    remove_extra_spaces: bool,
+    normalize_whitespace: bool,
+    remove_special_chars: bool,
+) -> str:
+    """按 (文本, 清理选项) 缓存清理结果，同一 OCR 结果重试或重复提交时不再重新清理
+
+    str 的哈希值会缓存在对象上，命中判断只需一次哈希和一次内存比较，远低于清理本身的开销。
+    每个条目会保留完整的多页 OCR 文本及其清理结果，只保留最近几条，避免服务进程常驻大量文本。
+    """
     cleaned = text
     
-    if cleaning_config.get("remove_extra_spaces", False):
-        # 移除多余空格，但保留换行
-        cleaned = re.sub(r"[ \t]+", " ", cleaned)
-        cleaned = re.sub(r" +", " ", cleaned)
+    if remove_extra_spaces:
+        # 移除多余空格，但保留换行（连续空格/制表符一次替换为单个空格）
+        if "  " in cleaned or "\t" in cleaned:
+            if len(cleaned) >= _ASCII_SPACES_MIN_LEN and cleaned.isascii():
+                cleaned = _collapse_ascii_spaces(cleaned)
+            else:
+                cleaned = _RE_SPACES.sub(" ", cleaned)
     
-    if cleaning_config.get("normalize_whitespace", False):
-        # 规范化空白字符
-        cleaned = re.sub(r"\r\n", "\n", cleaned)
-        cleaned = re.sub(r"\r", "\n", cleaned)
-        cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
+    if normalize_whitespace:
+        # 规范化空白字符：换行符统一用 str.replace，只有确实存在连续空行时才走正则
+        if "\r" in cleaned:
+            cleaned = cleaned.replace("\r\n", "\n").replace("\r", "\n")
+        if "\n\n\n" in cleaned:
+            cleaned = _RE_MANY_NEWLINES.sub("\n\n", cleaned)
     
-    if cleaning_config.get("remove_special_chars", False):
+    if remove_special_chars:
         # 移除特殊字符（保留中文、英文、数字、基本标点）
-        cleaned = re.sub(r"[^\w\s\u4e00-\u9fff，。、；：！？""''（）【】《》￥%]", "", cleaned)
+        if cleaned.isascii():
+            cleaned = cleaned.translate(_SPECIAL_CHARS_ASCII_TABLE)
+        else:
+            cleaned = _RE_SPECIAL_CHARS.sub("", cleaned)
     
     return cleaned.strip()
 
 
+# 候选值少于该数量时，逐个 `in` 查找比构建 Aho-Corasick 自动机更快
+_AC_MIN_VALUES = 6
+
+
+def _find_values_in_text(values: Iterable[str], text: str) -> Set[str]:
+    """一次扫描文本，返回在文本中出现过的字段值集合
+
+    候选值较多且安装了 pyahocorasick 时构建 Aho-Corasick 自动机，整体复杂度为 O(|text| + 匹配数)；
+    候选值很少时构建自动机的开销超过收益，直接逐个子串查找。
+    """
+    candidates = {value for value in values if value}
+    if not candidates or not text:
+        return set()
+    
+    if not AHOCORASICK_AVAILABLE or len(candidates) < _AC_MIN_VALUES:
+        return {value for value in candidates if value in text}
+    
+    automaton = ahocorasick.Automaton()
+    for value in candidates:
+        automaton.add_word(value, value)
+    automaton.make_automaton()
+    return {value for _, value in automaton.iter(text)}
+
+
 def _load_nlp_config(config_path: str = "configs/nlp.json") -> Dict[str, Any]:
     """加载NLP配置文件"""
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_file(config_path)
     except FileNotFoundError:
         # 返回默认配置
         return {
@@ -55,100 +165,97 @@ def _load_nlp_config(config_path: str = "configs/nlp.json") -> Dict[str, Any]:
 def _load_structure_config(config_file: str) -> Dict[str, Any]:
     """加载结构化配置文件"""
     try:
-        with open(config_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_file(config_file)
     except FileNotFoundError:
         raise FileNotFoundError(f"结构化配置文件不存在: {config_file}")
 
 
+@lru_cache(maxsize=1024)
+def _field_entity_type(field_name: str) -> Optional[str]:
+    """根据字段名判断对应的 NLP 实体类型（字段名在各文档间重复，结果缓存）"""
+    field_lower = field_name.lower()
+    if "日期" in field_name or "date" in field_lower:
+        return "dates"
+    if "金额" in field_name or "合计" in field_name or "amount" in field_lower or "money" in field_lower:
+        return "amounts"
+    if "电话" in field_name or "手机" in field_name or "phone" in field_lower:
+        return "phone_numbers"
+    return None
+
+
 def _calculate_field_confidence(
     field_value: Any,
     field_name: str,
     ocr_text: str,
     ocr_result: Dict[str, Any],
-    structure_config: Dict[str, Any],
+    pattern: str,
     entities: Dict[str, Any],
+    matched_values: Optional[Set[str]] = None,
 ) -> FieldConfidence:
-    """计算字段的置信度"""
-    confidence = 0.0
-    source = "llm"
-    needs_validation = False
+    """
+    计算字段的置信度
     
+    pattern 为该字段在结构化配置中的正则（无则传空串），由调用方预先取出。
+    matched_values 为预先计算好的“在 OCR 文本中出现的字段值”集合，
+    提供时不再对 ocr_text 做子串扫描。
+    """
+    # 空值直接返回，跳过文本匹配、实体与正则检查
     if field_value is None or field_value == "":
-        confidence = 0.0
-        needs_validation = True
+        return FieldConfidence(
+            value=field_value,
+            confidence=0.0,
+            source="llm",
+            needs_validation=True,
+        )
+    
+    source = "llm"
+    # 基础置信度：OCR 整体置信度
+    ocr_confidence = ocr_result.get("confidence", 0.0)
+    base_confidence = min(ocr_confidence, 95.0)  # 最高 95，留出空间给其他因素
+    
+    # 检查是否在 OCR 文本中找到该字段值
+    field_str = str(field_value)
+    if matched_values is not None:
+        found_in_text = field_str in matched_values
     else:
-        # 基础置信度：OCR 整体置信度
-        ocr_confidence = ocr_result.get("confidence", 0.0)
-        base_confidence = min(ocr_confidence, 95.0)  # 最高 95，留出空间给其他因素
-        
-        # 检查是否在 OCR 文本中找到该字段值
-        field_str = str(field_value)
-        if field_str in ocr_text:
-            confidence = base_confidence + 5.0  # 找到匹配，加分
-        else:
-            confidence = base_confidence - 10.0  # 未找到，减分
-        
-        # 检查 NLP 实体识别结果
-        field_lower = field_name.lower()
-        if "日期" in field_name or "date" in field_lower:
-            if entities.get("dates"):
-                confidence += 5.0
-                source = "nlp"
-        elif "金额" in field_name or "合计" in field_name or "amount" in field_lower or "money" in field_lower:
-            if entities.get("amounts"):
-                confidence += 5.0
-                source = "nlp"
-        elif "电话" in field_name or "手机" in field_name or "phone" in field_lower:
-            if entities.get("phone_numbers"):
-                confidence += 5.0
-                source = "nlp"
-        
-        # 使用正则验证（如果配置中有 pattern）
-        for item in structure_config.get("items", []):
-            if item.get("field") == field_name:
-                pattern = item.get("pattern", "")
-                if pattern:
-                    try:
-                        if re.search(pattern, field_str):
-                            confidence += 5.0
-                            source = "regex"
-                    except re.error:
-                        pass
-                break
-        
-        confidence = max(0.0, min(100.0, confidence))
+        found_in_text = field_str in ocr_text
+    if found_in_text:
+        confidence = base_confidence + 5.0  # 找到匹配，加分
+    else:
+        confidence = base_confidence - 10.0  # 未找到，减分
     
-    # 判断是否需要人工校验（≤80%）
-    if confidence <= 80.0:
-        needs_validation = True
+    # 检查 NLP 实体识别结果
+    entity_type = _field_entity_type(field_name)
+    if entity_type is not None and entities.get(entity_type):
+        confidence += 5.0
+        source = "nlp"
+    
+    # 使用正则验证（如果配置中有 pattern）
+    if pattern:
+        compiled = _compile_pattern(pattern)
+        if compiled is not None and compiled.search(field_str):
+            confidence += 5.0
+            source = "regex"
     
+    confidence = max(0.0, min(100.0, confidence))
+    
+    # 判断是否需要人工校验（≤80%）
     return FieldConfidence(
         value=field_value,
         confidence=round(confidence, 2),
         source=source,
-        needs_validation=needs_validation,
+        needs_validation=confidence <= 80.0,
     )
 
 
-def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Dict[str, Any]:
-    """
-    基于NLP、JSON结构化配置文件和LLM，对OCR结果进行结构化处理
-    
-    Args:
-        ocr_result: OCR识别结果字典，包含 'text' 字段和其他元数据
-        config_file: 结构化配置文件的路径（可选，如果未提供则从nlp.json读取）
-    
-    Returns:
-        结构化后的数据字典，包含置信度和校验清单
-    """
+def _load_configs(config_file: str | None) -> Tuple[Dict[str, Any], Dict[str, Any] | None]:
+    """加载NLP配置和结构化配置；NLP处理被禁用时结构化配置返回 None"""
     # 1. 加载NLP配置
     nlp_config = _load_nlp_config()
     nlp_processing = nlp_config.get("nlp_processing", {})
     
     if not nlp_processing.get("enabled", True):
-        # 如果NLP处理被禁用，直接返回原始OCR结果
-        return {"structured_data": None, "raw_ocr": ocr_result}
+        return nlp_processing, None
     
     # 2. 确定结构化配置文件路径
     if config_file is None:
@@ -157,38 +264,43 @@ def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Di
             raise ValueError("未提供结构化配置文件路径，且nlp.json中也没有配置structure_config_path")
     
     # 3. 加载结构化配置文件
-    structure_config = _load_structure_config(config_file)
-    
-    # 4. 提取OCR文本
-    ocr_text = ocr_result.get("text", "")
-    if not ocr_text:
-        # 如果没有文本，返回空结构
-        fields = {}
-        for item in structure_config.get("items", []):
-            field_name = item.get("field", "")
-            fields[field_name] = FieldConfidence(
-                value=None,
-                confidence=0.0,
-                source="llm",
-                needs_validation=True,
-            )
-        return {
-            "structured_data": StructuredData(
-                fields=fields,
-                coverage=0.0,
-                validation_list=list(fields.keys()),
-            ).model_dump(),
-            "raw_ocr": ocr_result,
-            "cleaned_text": "",
-            "structure_config": structure_config.get("title", "未知"),
-            "entities": {},
-        }
-    
-    # 5. NLP文本清理
-    text_cleaning_config = nlp_processing.get("text_cleaning", {})
-    cleaned_text = _clean_text(ocr_text, text_cleaning_config)
-    
-    # 6. NLP 实体识别
+    return nlp_processing, _load_structure_config(config_file)
+
+
+def _field_items(structure_config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """将结构化配置的 items 展平为 (字段名, 正则) 列表，每次处理只遍历配置一次"""
+    return [(item.get("field", ""), item.get("pattern", "")) for item in structure_config.get("items", [])]
+
+
+def _empty_text_result(
+    ocr_result: dict,
+    structure_config: Dict[str, Any],
+    items: List[Tuple[str, str]],
+) -> Dict[str, Any]:
+    """OCR 没有识别出文本时返回的空结构"""
+    fields = {}
+    for field_name, _ in items:
+        fields[field_name] = FieldConfidence(
+            value=None,
+            confidence=0.0,
+            source="llm",
+            needs_validation=True,
+        )
+    return {
+        "structured_data": StructuredData(
+            fields=fields,
+            coverage=0.0,
+            validation_list=list(fields.keys()),
+        ).model_dump(),
+        "raw_ocr": ocr_result,
+        "cleaned_text": "",
+        "structure_config": structure_config.get("title", "未知"),
+        "entities": {},
+    }
+
+
+def _extract_entities(cleaned_text: str) -> Dict[str, Any]:
+    """NLP 实体识别，失败时返回空字典"""
     entities = {}
     try:
         with log_performance("NLP实体识别", logger, {"text_length": len(cleaned_text)}):
@@ -198,34 +310,88 @@ def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Di
             logger.info(f"NLP实体识别完成 - 实体统计: {entity_counts}", extra={"context": {"entity_counts": entity_counts}})
     except Exception as e:
         log_exception(logger, "NLP实体识别失败", extra_context={"text_length": len(cleaned_text)})
-    
-    # 7. 使用LLM提取结构化数据
-    structured_data_raw = {}
+    return entities
+
+
+def _extract_with_llm(
+    cleaned_text: str,
+    structure_config: Dict[str, Any],
+    items: List[Tuple[str, str]],
+    ocr_result: dict,
+) -> Dict[str, Any]:
+    """使用LLM提取单页结构化数据，失败时所有字段为 None"""
     try:
-        with log_performance("LLM结构化提取", logger, {"text_length": len(cleaned_text), "fields_count": len(structure_config.get("items", []))}):
-            llm_service = LLMService()
+        with log_performance("LLM结构化提取", logger, {"text_length": len(cleaned_text), "fields_count": len(items)}):
+            llm_service = get_llm_service()
             structured_data_raw = llm_service.improve_json_structure(
                 ocr_text=cleaned_text,
                 structure_config=structure_config,
                 ocr_result=ocr_result,
             )
             extracted_fields = sum(1 for v in structured_data_raw.values() if v is not None and v != "")
-            logger.info(f"LLM结构化提取完成 - 已提取字段: {extracted_fields}/{len(structure_config.get('items', []))}", 
-                       extra={"context": {"extracted_fields": extracted_fields, "total_fields": len(structure_config.get("items", []))}})
+            logger.info(f"LLM结构化提取完成 - 已提取字段: {extracted_fields}/{len(items)}", 
+                       extra={"context": {"extracted_fields": extracted_fields, "total_fields": len(items)}})
+            return structured_data_raw
     except Exception as e:
         log_exception(logger, "LLM结构化处理失败", extra_context={"text_length": len(cleaned_text)})
         # 返回空结构
-        for item in structure_config.get("items", []):
-            field_name = item.get("field", "")
-            structured_data_raw[field_name] = None
+        return {field_name: None for field_name, _ in items}
+
+
+def _extract_batch_with_llm(
+    cleaned_texts: List[str],
+    structure_config: Dict[str, Any],
+    items: List[Tuple[str, str]],
+    ocr_results: List[dict],
+) -> List[Dict[str, Any]]:
+    """使用一次LLM请求提取多页结构化数据，批量请求失败时逐页回退"""
+    if len(cleaned_texts) == 1:
+        return [_extract_with_llm(cleaned_texts[0], structure_config, items, ocr_results[0])]
     
+    try:
+        with log_performance("LLM批量结构化提取", logger, {"pages": len(cleaned_texts), "fields_count": len(items)}):
+            return get_llm_service().improve_json_structure_batch(cleaned_texts, structure_config, ocr_results)
+    except Exception as e:
+        log_exception(logger, "LLM批量结构化处理失败，改为逐页处理", extra_context={"pages": len(cleaned_texts)})
+        return [
+            _extract_with_llm(text, structure_config, items, ocr_result)
+            for text, ocr_result in zip(cleaned_texts, ocr_results)
+        ]
+
+
+def _llm_batch_size(structure_config: Dict[str, Any], batch_size: int) -> int:
+    """按LLM的输出 token 预算收紧每批页数，避免批量输出被截断；获取LLM服务失败时沿用 batch_size"""
+    try:
+        limit = get_llm_service().max_batch_pages(structure_config)
+    except Exception:
+        log_exception(logger, "获取LLM批量页数上限失败，使用默认批大小", extra_context={"batch_size": batch_size})
+        return batch_size
+    if limit is None:
+        return batch_size
+    return max(1, min(batch_size, limit))
+
+
+def _build_structured_result(
+    ocr_result: dict,
+    cleaned_text: str,
+    structure_config: Dict[str, Any],
+    items: List[Tuple[str, str]],
+    entities: Dict[str, Any],
+    structured_data_raw: Dict[str, Any],
+) -> Dict[str, Any]:
+    """根据LLM提取结果计算置信度、覆盖率并组装最终结果"""
     # 8. 计算每个字段的置信度
     fields_with_confidence = {}
     validation_list = []
     extracted_count = 0
     
-    for item in structure_config.get("items", []):
-        field_name = item.get("field", "")
+    # 一次扫描确定哪些字段值出现在 OCR 文本中
+    matched_values = _find_values_in_text(
+        (str(v) for v in structured_data_raw.values() if v is not None and v != ""),
+        cleaned_text,
+    )
+    
+    for field_name, pattern in items:
         field_value = structured_data_raw.get(field_name)
         
         field_conf = _calculate_field_confidence(
@@ -233,8 +399,9 @@ def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Di
             field_name=field_name,
             ocr_text=cleaned_text,
             ocr_result=ocr_result,
-            structure_config=structure_config,
+            pattern=pattern,
             entities=entities,
+            matched_values=matched_values,
         )
         
         fields_with_confidence[field_name] = field_conf
@@ -246,12 +413,12 @@ def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Di
             validation_list.append(field_name)
     
     # 9. 计算覆盖率
-    total_fields = len(structure_config.get("items", []))
+    total_fields = len(items)
     coverage = (extracted_count / total_fields * 100) if total_fields > 0 else 0.0
     
     # 10. 构建结构化数据
     structured_data = StructuredData(
-        fields={k: v.model_dump() for k, v in fields_with_confidence.items()},
+        fields=fields_with_confidence,
         coverage=round(coverage, 2),
         validation_list=validation_list,
     )
@@ -269,3 +436,109 @@ def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Di
         "structure_config": structure_config.get("title", "未知"),
         "entities": entities,
     }
+
+
+def structure_ocr_result(ocr_result: dict, config_file: str | None = None) -> Dict[str, Any]:
+    """
+    基于NLP、JSON结构化配置文件和LLM，对OCR结果进行结构化处理
+    
+    Args:
+        ocr_result: OCR识别结果字典，包含 'text' 字段和其他元数据
+        config_file: 结构化配置文件的路径（可选，如果未提供则从nlp.json读取）
+    
+    Returns:
+        结构化后的数据字典，包含置信度和校验清单
+    """
+    # 1-3. 加载配置
+    nlp_processing, structure_config = _load_configs(config_file)
+    if structure_config is None:
+        # 如果NLP处理被禁用，直接返回原始OCR结果
+        return {"structured_data": None, "raw_ocr": ocr_result}
+    
+    items = _field_items(structure_config)
+    
+    # 4. 提取OCR文本
+    ocr_text = ocr_result.get("text", "")
+    if not ocr_text:
+        # 如果没有文本，返回空结构
+        return _empty_text_result(ocr_result, structure_config, items)
+    
+    # 5. NLP文本清理
+    text_cleaning_config = nlp_processing.get("text_cleaning", {})
+    cleaned_text = _clean_text(ocr_text, text_cleaning_config)
+    
+    # 6-7. LLM 提取（网络 I/O）与 NLP 实体识别互不依赖：LLM 请求放到后台线程，当前线程同时做实体识别
+    # 两个辅助函数都会自行捕获异常并返回降级结果
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-extract") as executor:
+        llm_future = executor.submit(_extract_with_llm, cleaned_text, structure_config, items, ocr_result)
+        entities = _extract_entities(cleaned_text)
+        structured_data_raw = llm_future.result()
+    
+    # 8-11. 计算置信度并组装结果
+    return _build_structured_result(ocr_result, cleaned_text, structure_config, items, entities, structured_data_raw)
+
+
+def structure_ocr_batch(
+    ocr_results: List[dict],
+    config_file: str | None = None,
+    batch_size: int = 10,
+) -> List[Dict[str, Any]]:
+    """
+    对多页OCR结果（如PDF的各页）进行结构化处理，多页文本合并为一次LLM请求
+    
+    Args:
+        ocr_results: OCR识别结果字典列表
+        config_file: 结构化配置文件的路径（可选，如果未提供则从nlp.json读取）
+        batch_size: 每次LLM请求包含的最大页数
+    
+    Returns:
+        与 ocr_results 一一对应的结构化结果列表，格式同 structure_ocr_result
+    """
+    nlp_processing, structure_config = _load_configs(config_file)
+    if structure_config is None:
+        return [{"structured_data": None, "raw_ocr": ocr_result} for ocr_result in ocr_results]
+    
+    items = _field_items(structure_config)
+    text_cleaning_config = nlp_processing.get("text_cleaning", {})
+    results: List[Dict[str, Any] | None] = [None] * len(ocr_results)
+    pending: List[Tuple[int, str]] = []
+    
+    for idx, ocr_result in enumerate(ocr_results):
+        ocr_text = ocr_result.get("text", "")
+        if not ocr_text:
+            results[idx] = _empty_text_result(ocr_result, structure_config, items)
+            continue
+        pending.append((idx, _clean_text(ocr_text, text_cleaning_config)))
+    
+    batch_size = max(1, batch_size)
+    
+    def _extract_batches() -> List[Tuple[List[Tuple[int, str]], List[Dict[str, Any]]]]:
+        # 各批次仍按顺序逐个请求LLM，不增加对LLM服务的并发压力
+        llm_batch_size = _llm_batch_size(structure_config, batch_size)
+        batches = [pending[start:start + llm_batch_size] for start in range(0, len(pending), llm_batch_size)]
+        return [
+            (
+                batch,
+                _extract_batch_with_llm(
+                    [cleaned_text for _, cleaned_text in batch],
+                    structure_config,
+                    items,
+                    [ocr_results[idx] for idx, _ in batch],
+                ),
+            )
+            for batch in batches
+        ]
+    
+    # LLM 请求在后台线程进行，当前线程同时逐页做实体识别
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-extract") as executor:
+        llm_future = executor.submit(_extract_batches) if pending else None
+        entities_by_idx = {idx: _extract_entities(cleaned_text) for idx, cleaned_text in pending}
+        batch_results = llm_future.result() if llm_future is not None else []
+    
+    for batch, raw_list in batch_results:
+        for (idx, cleaned_text), structured_data_raw in zip(batch, raw_list):
+            results[idx] = _build_structured_result(
+                ocr_results[idx], cleaned_text, structure_config, items, entities_by_idx[idx], structured_data_raw
+            )
+    
+    return results  # type: ignore[return-value]
@@ -1,55 +1,156 @@
 import os
 import json
+import filecmp
 import shutil
-from llm import LLMService
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any
+from logging_config import get_logger, log_exception
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+@lru_cache(maxsize=128)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    # 二进制读取，直接解码 UTF-8 字节；安装了 orjson 时用其解析
+    with open(path, "rb") as json_file:
+        return orjson.loads(json_file.read()) if ORJSON_AVAILABLE else json.load(json_file)
+
+def load_json_file(path: str) -> Any:
+    """读取 JSON 文件，按 (路径, 修改时间, 文件大小) 缓存解析结果，文件被修改后自动失效
+
+    check_structure_config 解析过的 origin 文件在 update_structure_config 中直接复用；
+    返回值为共享对象，调用方不要修改。
+    """
+    stat = os.stat(path)
+    return _load_json_cached(path, stat.st_mtime_ns, stat.st_size)
+
+def _atomic_write_text(path: str, text: str):
+    # 先写同目录临时文件再 os.replace，避免中途失败留下半个 json
+    directory, file_name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{file_name}.{uuid.uuid4().hex}")
+    # 以 0666 创建，由内核按进程 umask 计算权限，与 open(..., "w") 新建文件一致
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(text.encode("utf-8"))
+        # 覆盖已有文件时沿用其权限
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _atomic_copy(src: str, dst: str):
+    # copyfile 只复制内容（Linux 上走 sendfile），权限位与原 shutil.copy 一致单独复制
+    # 不使用硬链接：origin 原地修改会同步影响 temp，导致检查不出改动
+    directory, file_name = os.path.split(dst)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{file_name}.")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp_path)
+        shutil.copymode(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _list_dir_names(path: str) -> set[str]:
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries}
+
+# 同步状态：origin 文件名 -> 上次确认与 temp 一致时 origin 的 [st_mtime_ns, st_size]
+# 签名未变的文件直接视为未改动，不再读取文件内容
+_SYNC_STATE_PATH = "configs/structures/.sync_state.json"
+
+def _load_sync_state() -> dict[str, list[int]]:
+    try:
+        with open(_SYNC_STATE_PATH, "rb") as state_file:
+            state = json.load(state_file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+def _save_sync_state(state: dict[str, list[int]]):
+    _atomic_write_text(_SYNC_STATE_PATH, json.dumps(state, ensure_ascii=False, indent=4, sort_keys=True))
+
+def _file_signature(stat: os.stat_result) -> list[int]:
+    return [stat.st_mtime_ns, stat.st_size]
 
 # 清理 json 文件
 # 以 origin 目录下的文件为准，对于 new 和 temp 目录下的文件，如果不在 origin 目录下存在，则删除
 def clean_json_file():
-    origin_json_file_list = os.listdir("configs/structures/origin")
-    new_json_file_list = os.listdir("configs/structures/new")
-    temp_json_file_list = os.listdir("configs/structures/temp")
+    origin_json_file_list = _list_dir_names("configs/structures/origin")
+    new_json_file_list = _list_dir_names("configs/structures/new")
+    temp_json_file_list = _list_dir_names("configs/structures/temp")
+    # 汇总后一次性输出日志，避免逐个文件打印
+    messages = []
     for new_json_file in new_json_file_list:
         if new_json_file not in origin_json_file_list:
             os.remove(f"configs/structures/new/{new_json_file}")
-            print(f"删除 {new_json_file} 文件")
+            messages.append(f"删除 new/{new_json_file} 文件")
         else:
             if new_json_file not in temp_json_file_list:
                 os.remove(f"configs/structures/new/{new_json_file}")
-                print(f"删除 {new_json_file} 文件")
+                messages.append(f"删除 new/{new_json_file} 文件")
             else:
-                print(f"{new_json_file} 文件未改动")
+                messages.append(f"new/{new_json_file} 文件未改动")
     for temp_json_file in temp_json_file_list:
         if temp_json_file not in origin_json_file_list:
             os.remove(f"configs/structures/temp/{temp_json_file}")
-            print(f"删除 {temp_json_file} 文件")
+            messages.append(f"删除 temp/{temp_json_file} 文件")
         else:
-            print(f"{temp_json_file} 文件未改动")
+            messages.append(f"temp/{temp_json_file} 文件未改动")
+    if messages:
+        logger.info("清理JSON配置文件:\n" + "\n".join(messages), extra={"context": {"file_count": len(messages)}})
 
 # 检查结构化配置文件
 # 1. 检查 origin 里的 json 文件是否和 temp 里的 json 文件一致
-# 1.1 如果一致，说明该配置文件没有改动，直接返回
+# 1.1 如果一致，说明该配置文件没有改动，直接返回（先按字节比较，字节不同才解析 json 比较内容）
 # 1.2 如果不一致，说明该配置文件有改动，记录下存在不同的文件名
 # 1.3 返回存在不同的文件名列表
+# 已确认一致的文件记录 origin 的修改时间和大小，下次检查时签名未变则直接跳过
 
 def check_structure_config()->list[str]:
-    origin_json_file_name_list = os.listdir("configs/structures/origin")
-    temp_json_file_name_list = os.listdir("configs/structures/temp")
+    with os.scandir("configs/structures/origin") as entries:
+        origin_json_file_entries = {entry.name: entry for entry in entries}
+    temp_json_file_name_list = _list_dir_names("configs/structures/temp")
 
     updated_json_file_name_list = []
+    sync_state = _load_sync_state()
+    new_sync_state = {}
 
-    for origin_json_file_name in origin_json_file_name_list:
+    for origin_json_file_name, origin_json_file_entry in origin_json_file_entries.items():
         if origin_json_file_name not in temp_json_file_name_list:
             updated_json_file_name_list.append(origin_json_file_name)
+            continue
+        signature = _file_signature(origin_json_file_entry.stat())
+        if sync_state.get(origin_json_file_name) == signature:
+            # 上次同步后 origin 未被修改（修改时间与大小均一致），无需读取文件
+            new_sync_state[origin_json_file_name] = signature
+        elif filecmp.cmp(f"configs/structures/origin/{origin_json_file_name}", f"configs/structures/temp/{origin_json_file_name}", shallow=False):
+            # 字节完全一致，无需解析 json
+            new_sync_state[origin_json_file_name] = signature
         else:
-            origin_json_file = open(f"configs/structures/origin/{origin_json_file_name}", "r", encoding="utf-8")
-            origin_json_file_content = json.load(origin_json_file)
-            origin_json_file.close()
-            temp_json_file = open(f"configs/structures/temp/{origin_json_file_name}", "r", encoding="utf-8")
-            temp_json_file_content = json.load(temp_json_file)
-            temp_json_file.close()
+            # 字节不同时再按 json 内容比较（忽略格式、缩进差异）
+            origin_json_file_content = load_json_file(f"configs/structures/origin/{origin_json_file_name}")
+            temp_json_file_content = load_json_file(f"configs/structures/temp/{origin_json_file_name}")
             if origin_json_file_content != temp_json_file_content:
                 updated_json_file_name_list.append(origin_json_file_name)
+            else:
+                new_sync_state[origin_json_file_name] = signature
+
+    # 需要更新的文件在 update_structure_config 完成后再记录
+    if new_sync_state != sync_state:
+        _save_sync_state(new_sync_state)
     return updated_json_file_name_list
 
 # 1. 输入参数为 需要更新的文件名列表
@@ -57,13 +158,32 @@ def check_structure_config()->list[str]:
 # 3. 将 origin 里的 json 文件复制到 temp 里，名称与 origin 里的文件名一致，如果 temp 里不存在该文件，则创建，如果存在该文件，则覆盖
 
 def update_structure_config(updated_json_file_name_list: list[str]):
-    llm_service = LLMService()
-    for updated_json_file_name in updated_json_file_name_list:
-        origin_json_file = open(f"configs/structures/origin/{updated_json_file_name}", "r", encoding="utf-8")
-        origin_json_file_content = json.load(origin_json_file)
-        origin_json_file.close()
-        professional_json_content = llm_service.format_json_into_professional(json.dumps(origin_json_file_content, ensure_ascii=False, indent=4))
-        new_json_file = open(f"configs/structures/new/{updated_json_file_name}", "w", encoding="utf-8")
-        new_json_file.write(json.dumps(professional_json_content, ensure_ascii=False, indent=4))
-        new_json_file.close()
-        shutil.copy(f"configs/structures/origin/{updated_json_file_name}", f"configs/structures/temp/{updated_json_file_name}")
\ No newline at end of file
+    if not updated_json_file_name_list:
+        return
+    # 延迟导入：LangChain 只在确实需要重新生成配置时加载，不拖慢服务启动
+    from llm import get_llm_service
+    llm_service = get_llm_service()
+    origin_json_str_list = [
+        json.dumps(load_json_file(f"configs/structures/origin/{updated_json_file_name}"), ensure_ascii=False, indent=4)
+        for updated_json_file_name in updated_json_file_name_list
+    ]
+    # LLM 调用受网络延迟限制，并发发出；每个调用完成后立即在当前线程写入，单个失败不影响其他文件
+    sync_state = _load_sync_state()
+    with ThreadPoolExecutor(max_workers=min(8, len(updated_json_file_name_list))) as executor:
+        future_to_name = {
+            executor.submit(llm_service.format_json_into_professional, origin_json_str): updated_json_file_name
+            for updated_json_file_name, origin_json_str in zip(updated_json_file_name_list, origin_json_str_list)
+        }
+        for future in as_completed(future_to_name):
+            updated_json_file_name = future_to_name[future]
+            try:
+                professional_json_content = future.result()
+            except Exception:
+                log_exception(logger, f"结构化配置专业化失败: {updated_json_file_name}", extra_context={"file_name": updated_json_file_name})
+                continue
+            _atomic_write_text(f"configs/structures/new/{updated_json_file_name}", json.dumps(professional_json_content, ensure_ascii=False, indent=4))
+            # 复制前取签名：复制过程中 origin 若再被修改，下次检查签名不一致会重新比较
+            signature = _file_signature(os.stat(f"configs/structures/origin/{updated_json_file_name}"))
+            _atomic_copy(f"configs/structures/origin/{updated_json_file_name}", f"configs/structures/temp/{updated_json_file_name}")
+            sync_state[updated_json_file_name] = signature
+    _save_sync_state(sync_state)
\ No newline at end of file
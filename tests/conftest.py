@@ -1,9 +1,12 @@
 """
 pytest 配置和共享 fixtures
+
+sample_* 系列 fixture 为会话级，整个测试会话只构建一次，测试中请勿原地修改。
 """
 import json
 import os
 import tempfile
+import uuid
 from pathlib import Path
 from typing import Dict, Any
 
@@ -12,14 +15,46 @@ from PIL import Image
 import io
 
 
-@pytest.fixture
-def temp_dir():
-    """创建临时目录"""
-    with tempfile.TemporaryDirectory() as tmpdir:
+@pytest.fixture(scope="session")
+def _tmp_root():
+    """会话级临时根目录，测试结束后统一清理"""
+    with tempfile.TemporaryDirectory(prefix="dococr_") as tmpdir:
         yield Path(tmpdir)
 
 
 @pytest.fixture
+def temp_dir(_tmp_root):
+    """创建临时目录（会话临时根目录下的独立子目录）"""
+    path = _tmp_root / f"t_{uuid.uuid4().hex}"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture(scope="session")
+def client():
+    """创建测试客户端（整个测试会话共享一个应用实例）
+    
+    注意：如果TestClient初始化失败（可能是httpx/starlette版本问题），
+    这些集成测试会被跳过。
+    """
+    try:
+        from fastapi.testclient import TestClient
+    except (ImportError, TypeError):
+        pytest.skip("TestClient not available, skipping integration tests")
+    
+    from main import app
+    
+    # 尝试创建TestClient，捕获所有可能的异常
+    try:
+        return TestClient(app)
+    except Exception as e:
+        # 如果初始化失败，跳过所有使用这个fixture的测试
+        pytest.skip(f"TestClient initialization failed: {type(e).__name__}: {e}. "
+                   f"This may be due to httpx/starlette version compatibility. "
+                   f"Skipping integration tests.")
+
+
+@pytest.fixture(scope="session")
 def sample_image():
     """创建测试图片"""
     # 创建一个简单的测试图片
@@ -27,7 +62,7 @@ def sample_image():
     return img
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_image_bytes(sample_image):
     """创建测试图片字节数据"""
     buffer = io.BytesIO()
@@ -35,7 +70,21 @@ def sample_image_bytes(sample_image):
     return buffer.getvalue()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def pytesseract_preprocessed(sample_image_bytes):
+    """sample_image_bytes 经 pytesseract 预处理后的结果（整个会话只计算一次）"""
+    from pre_preocess import pre_preocess_for_pytesseract
+    return pre_preocess_for_pytesseract(sample_image_bytes)
+
+
+@pytest.fixture(scope="session")
+def google_vision_preprocessed(sample_image_bytes):
+    """sample_image_bytes 经 Google Vision 预处理后的结果（整个会话只计算一次）"""
+    from pre_preocess import pre_preocess_for_google_vision
+    return pre_preocess_for_google_vision(sample_image_bytes)
+
+
+@pytest.fixture(scope="session")
 def sample_pdf_bytes():
     """创建测试PDF字节数据"""
     # 这是一个最小的PDF文件（仅用于测试）
@@ -50,7 +99,7 @@ def sample_pdf_bytes():
     return pdf_data
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_text():
     """示例OCR文本"""
     return """
@@ -63,9 +112,9 @@ def sample_text():
 
 
 @pytest.fixture
-def mock_ocr_config(temp_dir):
-    """创建模拟OCR配置文件"""
-    config = {
+def mock_ocr_config_dict():
+    """模拟OCR配置（内存字典，无需落盘的测试直接使用）"""
+    return {
         "ocr_engines": {
             "current": "pytesseract",
             "engines": {
@@ -83,19 +132,23 @@ def mock_ocr_config(temp_dir):
             }
         }
     }
-    
+
+
+@pytest.fixture
+def mock_ocr_config(temp_dir, mock_ocr_config_dict):
+    """创建模拟OCR配置文件"""
     config_path = temp_dir / "ocr.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
     with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+        json.dump(mock_ocr_config_dict, f, ensure_ascii=False, indent=2)
     
     return config_path
 
 
 @pytest.fixture
-def mock_llm_config(temp_dir):
-    """创建模拟LLM配置文件"""
-    config = {
+def mock_llm_config_dict():
+    """模拟LLM配置（内存字典，无需落盘的测试直接使用）"""
+    return {
         "llm_services": {
             "current": "mock",
             "services": {
@@ -107,19 +160,23 @@ def mock_llm_config(temp_dir):
             }
         }
     }
-    
+
+
+@pytest.fixture
+def mock_llm_config(temp_dir, mock_llm_config_dict):
+    """创建模拟LLM配置文件"""
     config_path = temp_dir / "init.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
     with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+        json.dump(mock_llm_config_dict, f, ensure_ascii=False, indent=2)
     
     return config_path
 
 
 @pytest.fixture
-def mock_structure_config(temp_dir):
-    """创建模拟结构化配置文件"""
-    config = {
+def mock_structure_config_dict():
+    """模拟结构化配置（内存字典，无需落盘的测试直接使用）"""
+    return {
         "title": "发票",
         "description": "发票结构化配置",
         "items": [
@@ -141,19 +198,23 @@ def mock_structure_config(temp_dir):
             }
         ]
     }
-    
+
+
+@pytest.fixture
+def mock_structure_config(temp_dir, mock_structure_config_dict):
+    """创建模拟结构化配置文件"""
     config_path = temp_dir / "invoice.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
     with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+        json.dump(mock_structure_config_dict, f, ensure_ascii=False, indent=2)
     
     return config_path
 
 
 @pytest.fixture
-def mock_nlp_config(temp_dir):
-    """创建模拟NLP配置文件"""
-    config = {
+def mock_nlp_config_dict():
+    """模拟NLP配置（内存字典，无需落盘的测试直接使用）"""
+    return {
         "nlp_processing": {
             "enabled": True,
             "text_cleaning": {
@@ -167,16 +228,20 @@ def mock_nlp_config(temp_dir):
             "structure_config_path": "configs/structures/origin/invoice0.json"
         }
     }
-    
+
+
+@pytest.fixture
+def mock_nlp_config(temp_dir, mock_nlp_config_dict):
+    """创建模拟NLP配置文件"""
     config_path = temp_dir / "nlp.json"
     config_path.parent.mkdir(parents=True, exist_ok=True)
     with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, ensure_ascii=False, indent=2)
+        json.dump(mock_nlp_config_dict, f, ensure_ascii=False, indent=2)
     
     return config_path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ocr_result():
     """示例OCR结果"""
     return {
@@ -189,7 +254,7 @@ def sample_ocr_result():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_structured_result():
     """示例结构化结果"""
     return {
@@ -11,29 +11,6 @@ except (ImportError, TypeError) as e:
     TESTCLIENT_AVAILABLE = False
     TestClient = None
 
-from main import app
-
-
-@pytest.fixture(scope="module")
-def client():
-    """创建测试客户端
-    
-    注意：如果TestClient初始化失败（可能是httpx/starlette版本问题），
-    这些集成测试会被跳过。
-    """
-    if not TESTCLIENT_AVAILABLE:
-        pytest.skip("TestClient not available, skipping integration tests")
-    
-    # 尝试创建TestClient，捕获所有可能的异常
-    try:
-        client_instance = TestClient(app)
-        return client_instance
-    except Exception as e:
-        # 如果初始化失败，跳过所有使用这个fixture的测试
-        pytest.skip(f"TestClient initialization failed: {type(e).__name__}: {e}. "
-                   f"This may be due to httpx/starlette version compatibility. "
-                   f"Skipping integration tests.")
-
 
 class TestHealthEndpoint:
     """健康检查端点测试"""
@@ -0,0 +1,106 @@
+"""
+LLM 服务模块测试
+"""
+import json
+
+import pytest
+
+from llm import LLMService, get_llm_service
+
+
+STRUCTURE_CONFIG = {
+    "title": "发票",
+    "items": [
+        {"field": "发票号码", "type": "text"},
+        {"field": "金额", "type": "number"},
+    ],
+}
+
+
+@pytest.fixture
+def llm_service(temp_dir):
+    """使用 mock provider 的 LLM 服务"""
+    config_file = temp_dir / "init.json"
+    config_file.write_text(json.dumps({
+        "llm_services": {
+            "current": "mock",
+            "services": {"mock": {"provider": "mock", "max_tokens": 2000}},
+        }
+    }), encoding="utf-8")
+    return LLMService(config_path=str(config_file))
+
+
+class TestImproveJsonStructureBatch:
+    """improve_json_structure_batch 方法测试"""
+    
+    def test_batch_results_keyed_by_page_index(self, llm_service, monkeypatch):
+        """测试按段编号取回每页结果，与返回对象中的键顺序无关"""
+        prompts = []
+        
+        def generate_text(prompt):
+            prompts.append(prompt)
+            return json.dumps({"2": {"发票号码": "B"}, "1": {"发票号码": "A"}})
+        
+        monkeypatch.setattr(llm_service, "generate_text", generate_text)
+        results = llm_service.improve_json_structure_batch(
+            ["第一页", "第二页"],
+            STRUCTURE_CONFIG,
+            [{"text": "第一页", "text_blocks": []}, {"text": "第二页"}],
+        )
+        
+        assert results == [{"发票号码": "A"}, {"发票号码": "B"}]
+        # 只有带文本块的页追加位置提示，与单页提示词一致
+        assert prompts[0].count("文本块的位置信息") == 1
+        assert prompts[0].index("文本块的位置信息") < prompts[0].index("【第 2 段】")
+    
+    @pytest.mark.parametrize("response", [
+        [{"发票号码": "A"}, {"发票号码": "B"}],
+        {"1": {"发票号码": "A"}},
+        {"1": {"发票号码": "A"}, "2": None},
+    ])
+    def test_batch_rejects_missing_pages(self, llm_service, monkeypatch, response):
+        """测试缺少任一段编号时抛出异常，交由调用方逐页回退"""
+        monkeypatch.setattr(llm_service, "generate_text", lambda prompt: json.dumps(response))
+        with pytest.raises(ValueError):
+            llm_service.improve_json_structure_batch(["第一页", "第二页"], STRUCTURE_CONFIG)
+
+
+class TestMaxBatchPages:
+    """max_batch_pages 方法测试"""
+    
+    @pytest.mark.parametrize("max_tokens, expected", [
+        (2000, 23),
+        (100, 1),
+        (None, None),
+    ])
+    def test_max_batch_pages(self, llm_service, max_tokens, expected):
+        """测试按 max_tokens 估算每批最多页数"""
+        llm_service.service_config["max_tokens"] = max_tokens
+        assert llm_service.max_batch_pages(STRUCTURE_CONFIG) == expected
+    
+    def test_max_batch_pages_shrinks_with_field_count(self, llm_service):
+        """测试字段越多每批页数越少"""
+        many_fields = {"items": [{"field": f"字段{i}"} for i in range(30)]}
+        assert llm_service.max_batch_pages(many_fields) < llm_service.max_batch_pages(STRUCTURE_CONFIG)
+
+
+class TestGetLlmService:
+    """get_llm_service 函数测试"""
+    
+    def test_cached_per_config_path(self, temp_dir):
+        """测试同一配置路径复用实例，不同配置路径各自创建实例"""
+        config_paths = []
+        for name in ("first.json", "second.json"):
+            config_file = temp_dir / name
+            config_file.write_text(json.dumps({
+                "llm_services": {
+                    "current": "mock",
+                    "services": {"mock": {"provider": "mock", "max_tokens": 1000}},
+                }
+            }), encoding="utf-8")
+            config_paths.append(str(config_file))
+        
+        first = get_llm_service(config_paths[0])
+        
+        assert get_llm_service(config_paths[0]) is first
+        assert get_llm_service(config_paths[1]) is not first
@@ -54,6 +54,27 @@ class TestEntityRecognizer:
         assert any("test@example.com" in e["text"] for e in emails)
         assert any("admin@test.org" in e["text"] for e in emails)
     
+    @pytest.mark.parametrize("make_text", [
+        lambda n: "ab-" * n,
+        lambda n: "a@" + "a." * n,
+    ])
+    def test_extract_emails_regex_long_run_is_linear(self, make_text):
+        """测试长串无效邮箱文本不会触发二次回溯：输入变为 4 倍时耗时增长远小于 16 倍"""
+        import time
+        recognizer = EntityRecognizer(model_name=None)
+        
+        def best_time(text):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                assert recognizer._extract_emails_regex(text) == []
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+        
+        small = best_time(make_text(5000))
+        large = best_time(make_text(20000))
+        assert large < small * 8 + 0.05
+    
     def test_extract_ids_regex(self):
         """测试身份证号正则提取"""
         recognizer = EntityRecognizer(model_name=None)
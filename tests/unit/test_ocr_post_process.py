@@ -71,6 +71,26 @@ class TestOCRPostProcessor:
         # 如果替换成功，应该包含"发票号码"，否则保持原样（因为 \b 对中文无效）
         assert "发票号玛" in result or "发票号码" in result
     
+    @pytest.mark.parametrize("ahocorasick_available", [True, False])
+    def test_correct_text_exact_match_multiple_words(self, ahocorasick_available, monkeypatch):
+        """测试一次扫描替换多个词汇（长词优先、保留单词边界）"""
+        import ocr_post_process
+        if ahocorasick_available and not ocr_post_process.AHOCORASICK_AVAILABLE:
+            pytest.skip("pyahocorasick 未安装")
+        monkeypatch.setattr("ocr_post_process.AHOCORASICK_AVAILABLE", ahocorasick_available)
+        
+        processor = OCRPostProcessor()
+        processor.add_custom_word("invoice", "INVOICE")
+        processor.add_custom_word("invoice no", "INVOICE NO.")
+        text = "invoice no 123, invoices, total invoice"
+        corrected = processor.correct_text(text, use_fuzzy_match=False)
+        assert corrected == "INVOICE NO. 123, invoices, total INVOICE"
+        
+        # 新增词汇后重新构建匹配器
+        processor.add_custom_word("total", "TOTAL")
+        corrected = processor.correct_text(text, use_fuzzy_match=False)
+        assert corrected == "INVOICE NO. 123, invoices, TOTAL INVOICE"
+    
     def test_correct_text_no_match(self):
         """测试无匹配的文本"""
         processor = OCRPostProcessor()
@@ -91,6 +111,21 @@ class TestOCRPostProcessor:
         # 模糊匹配可能会替换，取决于相似度
         assert isinstance(corrected, str)
     
+    @pytest.mark.parametrize("rapidfuzz_available", [True, False])
+    def test_fuzzy_replace_backends(self, rapidfuzz_available, monkeypatch):
+        """测试 rapidfuzz 与 difflib 两种模糊匹配实现"""
+        import ocr_post_process
+        if rapidfuzz_available and not ocr_post_process.RAPIDFUZZ_AVAILABLE:
+            pytest.skip("rapidfuzz 未安装")
+        monkeypatch.setattr("ocr_post_process.RAPIDFUZZ_AVAILABLE", rapidfuzz_available)
+        
+        processor = OCRPostProcessor()
+        processor.add_custom_word("发票号码", "发票编号")
+        processor.add_custom_word("invoice", "INVOICE")
+        
+        corrected = processor.correct_text("发票号玛 invoise total", use_fuzzy_match=True, fuzzy_threshold=0.7)
+        assert corrected == "发票编号 INVOICE total"
+    
     def test_correct_text_blocks(self):
         """测试文本块校正"""
         processor = OCRPostProcessor()
@@ -106,6 +141,27 @@ class TestOCRPostProcessor:
         assert "发票号码" in corrected_blocks[0]["text"] or "发票号玛" in corrected_blocks[0]["text"]
         assert "日期" in corrected_blocks[1]["text"]
     
+    def test_correct_text_blocks_matches_per_block(self):
+        """测试批量校正结果与逐块校正一致（块边界视为单词边界）"""
+        processor = OCRPostProcessor()
+        processor.add_custom_word("invoice", "INVOICE")
+        
+        text_blocks = [
+            {"text": "invoice", "confidence": 0.9},
+            {"confidence": 0.5},
+            {"text": "no invoice\there", "confidence": 0.8},
+            {"text": "", "confidence": 0.7},
+        ]
+        
+        corrected_blocks = processor.correct_text_blocks(text_blocks, use_fuzzy_match=False)
+        assert corrected_blocks == [
+            {"text": "INVOICE", "confidence": 0.9},
+            {"confidence": 0.5},
+            {"text": "no INVOICE\there", "confidence": 0.8},
+            {"text": "", "confidence": 0.7},
+        ]
+        assert text_blocks[0]["text"] == "invoice"
+    
     def test_add_custom_word(self):
         """测试动态添加自定义词汇"""
         processor = OCRPostProcessor()
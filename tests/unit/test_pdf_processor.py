@@ -0,0 +1,53 @@
+"""
+PDF 处理模块测试
+"""
+import pytest
+from PIL import Image
+
+import pdf_processor
+from pdf_processor import is_pdf, process_pdf
+
+
+class TestIsPDF:
+    """is_pdf 函数测试"""
+
+    def test_is_pdf_true(self, sample_pdf_bytes):
+        """测试识别 PDF 数据"""
+        assert is_pdf(sample_pdf_bytes) is True
+
+    def test_is_pdf_false(self, sample_image_bytes):
+        """测试非 PDF 数据"""
+        assert is_pdf(sample_image_bytes) is False
+
+    def test_is_pdf_short_data(self):
+        """测试长度不足 4 字节的数据"""
+        assert is_pdf(b"") is False
+        assert is_pdf(b"%PD") is False
+
+
+@pytest.mark.skipif(not pdf_processor.PYMUPDF_AVAILABLE, reason="PyMuPDF 未安装")
+class TestProcessPDF:
+    """process_pdf 函数测试"""
+
+    def test_process_pdf_renders_page_image(self, sample_pdf_bytes):
+        """测试每页直接返回渲染好的图片，不再附带 PNG 编码字节"""
+        pages = process_pdf(sample_pdf_bytes, dpi=72)
+
+        assert len(pages) == 1
+        page = pages[0]
+        assert page["page_number"] == 1
+        assert isinstance(page["image"], Image.Image)
+        assert page["image"].mode == "RGB"
+        assert page["image"].size[0] > 0 and page["image"].size[1] > 0
+        assert "image_bytes" not in page
+
+    def test_process_pdf_blank_page_is_image_only(self, sample_pdf_bytes):
+        """测试无文本页面被标记为图片页"""
+        page = process_pdf(sample_pdf_bytes, dpi=72)[0]
+        assert page["has_text"] is False
+        assert page["is_image_only"] is True
+
+    def test_process_pdf_grayscale(self, sample_pdf_bytes):
+        """测试直接渲染灰度页面"""
+        page = process_pdf(sample_pdf_bytes, dpi=72, grayscale=True)[0]
+        assert page["image"].mode == "L"
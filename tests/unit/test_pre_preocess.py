@@ -8,20 +8,30 @@ from PIL import Image
 
 from pre_preocess import (
     pre_preocess_for_pytesseract,
-    pre_preocess_for_google_vision,
     preprocess_image,
-    correct_skew
+    correct_skew,
+    _close_rect_separable
 )
 
 
+@pytest.fixture(scope="module", params=[(10, 10), (100, 100), (1000, 1000)], ids=lambda size: f"{size[0]}x{size[1]}")
+def sized_image(request):
+    """不同尺寸的白色测试图像（模块内只创建一次）"""
+    return Image.new('RGB', request.param, color=(255, 255, 255))
+
+
 class TestPreProcessForPytesseract:
     """pytesseract 预处理测试"""
     
-    def test_pre_preocess_for_pytesseract(self, sample_image_bytes):
+    def test_pre_preocess_for_pytesseract(self, pytesseract_preprocessed):
         """测试 pytesseract 预处理"""
-        result = pre_preocess_for_pytesseract(sample_image_bytes)
-        assert result is not None
+        assert isinstance(pytesseract_preprocessed, Image.Image)
+    
+    def test_pre_preocess_for_pytesseract_accepts_image(self, sample_image):
+        """测试直接传入已解码的 PIL 图片"""
+        result = pre_preocess_for_pytesseract(sample_image)
         assert isinstance(result, Image.Image)
+        assert result.size == sample_image.size
     
     def test_pre_preocess_for_pytesseract_invalid_data(self):
         """测试无效数据的预处理"""
@@ -34,18 +44,14 @@ class TestPreProcessForPytesseract:
 class TestPreProcessForGoogleVision:
     """Google Vision 预处理测试"""
     
-    def test_pre_preocess_for_google_vision(self, sample_image_bytes):
+    def test_pre_preocess_for_google_vision(self, google_vision_preprocessed):
         """测试 Google Vision 预处理"""
-        result = pre_preocess_for_google_vision(sample_image_bytes)
-        assert result is not None
-        assert isinstance(result, Image.Image)
+        assert isinstance(google_vision_preprocessed, Image.Image)
     
-    def test_pre_preocess_for_google_vision_preserves_color(self, sample_image_bytes):
+    def test_pre_preocess_for_google_vision_preserves_color(self, google_vision_preprocessed, sample_image):
         """测试 Google Vision 预处理保留颜色"""
-        result = pre_preocess_for_google_vision(sample_image_bytes)
         # Google Vision 应该保留颜色信息
-        assert result is not None
-        assert isinstance(result, Image.Image)
+        assert google_vision_preprocessed.mode == sample_image.mode
 
 
 class TestPreprocessImage:
@@ -67,54 +73,27 @@ class TestPreprocessImage:
         # 保留颜色时应该还是彩色图
         assert result.mode in ['RGB', 'RGBA', 'L']
     
-    def test_preprocess_image_small_image(self):
-        """测试小图像预处理"""
-        # 创建一个很小的测试图像
-        small_img = Image.new('RGB', (10, 10), color=(255, 255, 255))
-        result = preprocess_image(small_img, preserve_color=False)
-        assert result is not None
-        assert isinstance(result, Image.Image)
-    
-    def test_preprocess_image_large_image(self):
-        """测试大图像预处理"""
-        # 创建一个较大的测试图像
-        large_img = Image.new('RGB', (1000, 1000), color=(255, 255, 255))
-        result = preprocess_image(large_img, preserve_color=False)
-        assert result is not None
+    def test_preprocess_image_sizes(self, sized_image):
+        """测试不同尺寸图像预处理"""
+        result = preprocess_image(sized_image, preserve_color=False)
         assert isinstance(result, Image.Image)
+        assert result.size == sized_image.size
 
 
 class TestCorrectSkew:
     """correct_skew 函数测试"""
     
-    def test_correct_skew_no_skew(self):
-        """测试无倾斜的图像"""
-        # 创建一个无倾斜的图像
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 255
-        result = correct_skew(img)
-        assert result is not None
-        assert result.shape == img.shape
-    
-    def test_correct_skew_grayscale(self):
-        """测试灰度图像倾斜校正"""
-        img = np.ones((100, 100), dtype=np.uint8) * 255
-        result = correct_skew(img)
-        assert result is not None
-        assert result.shape == img.shape
-    
-    def test_correct_skew_color_image(self):
-        """测试彩色图像倾斜校正"""
-        img = np.ones((100, 100, 3), dtype=np.uint8) * 255
-        result = correct_skew(img)
-        assert result is not None
-        assert result.shape == img.shape
-    
-    def test_correct_skew_small_image(self):
-        """测试小图像倾斜校正"""
-        img = np.ones((10, 10, 3), dtype=np.uint8) * 255
+    @pytest.mark.parametrize(
+        "shape",
+        [(100, 100, 3), (100, 100), (10, 10, 3)],
+        ids=["color", "grayscale", "small"],
+    )
+    def test_correct_skew_keeps_shape(self, shape):
+        """测试无倾斜图像（彩色、灰度、小图）校正后尺寸不变"""
+        img = np.ones(shape, dtype=np.uint8) * 255
         result = correct_skew(img)
         assert result is not None
-        assert result.shape == img.shape
+        assert result.shape == shape
     
     def test_correct_skew_exception_handling(self):
         """测试异常处理"""
@@ -129,35 +108,40 @@ class TestCorrectSkew:
             pytest.skip("correct_skew 函数对空图像的处理方式")
 
 
+class TestCloseRectSeparable:
+    """_close_rect_separable 函数测试"""
+    
+    def test_matches_dense_kernel_close(self):
+        """测试可分离闭运算与稠密核闭运算结果一致"""
+        import cv2
+        rng = np.random.default_rng(0)
+        img = ((rng.random((64, 80)) > 0.6) * 255).astype(np.uint8)
+        expected = cv2.morphologyEx(img, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8), iterations=1)
+        result = _close_rect_separable(img, 5)
+        assert np.array_equal(result, expected)
+
+
 class TestPreProcessIntegration:
     """预处理集成测试"""
     
-    def test_full_preprocess_pipeline(self, sample_image_bytes):
+    def test_full_preprocess_pipeline(self, pytesseract_preprocessed, google_vision_preprocessed, sample_image):
         """测试完整预处理流程"""
-        # 测试 pytesseract 预处理流程
-        result = pre_preocess_for_pytesseract(sample_image_bytes)
-        assert result is not None
-        assert isinstance(result, Image.Image)
+        # pytesseract 预处理流程输出二值化灰度图
+        assert isinstance(pytesseract_preprocessed, Image.Image)
+        assert pytesseract_preprocessed.mode == "L"
+        assert pytesseract_preprocessed.size == sample_image.size
         
-        # 测试 Google Vision 预处理流程
-        result2 = pre_preocess_for_google_vision(sample_image_bytes)
-        assert result2 is not None
-        assert isinstance(result, Image.Image)
+        # Google Vision 预处理流程
+        assert isinstance(google_vision_preprocessed, Image.Image)
+        assert google_vision_preprocessed.size == sample_image.size
     
-    def test_preprocess_different_image_formats(self):
+    @pytest.mark.parametrize("mode,color", [
+        ('RGB', (255, 0, 0)),
+        ('RGBA', (255, 0, 0, 128)),
+        ('L', 128),
+    ])
+    def test_preprocess_different_image_formats(self, mode, color):
         """测试不同图像格式的预处理"""
-        # 测试 RGB 图像
-        rgb_img = Image.new('RGB', (100, 100), color=(255, 0, 0))
-        result = preprocess_image(rgb_img, preserve_color=False)
-        assert result is not None
-        
-        # 测试 RGBA 图像
-        rgba_img = Image.new('RGBA', (100, 100), color=(255, 0, 0, 128))
-        result = preprocess_image(rgba_img, preserve_color=False)
-        assert result is not None
-        
-        # 测试灰度图像
-        gray_img = Image.new('L', (100, 100), color=128)
-        result = preprocess_image(gray_img, preserve_color=False)
+        img = Image.new(mode, (100, 100), color=color)
+        result = preprocess_image(img, preserve_color=False)
         assert result is not None
-
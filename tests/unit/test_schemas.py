@@ -12,6 +12,32 @@ from schemas import (
     BatchProcessingResult
 )
 
+# 置信度/覆盖率范围边界：(取值, 是否合法)
+RANGE_CASES = [(0.0, True), (50.0, True), (100.0, True), (-1.0, False), (101.0, False)]
+
+
+@pytest.fixture(scope="module")
+def sample_field():
+    """已校验的字段置信度实例（模块内共享，只读）"""
+    return FieldConfidence(value="value1", confidence=90.0)
+
+
+@pytest.fixture(scope="module")
+def sample_structured(sample_field):
+    """已校验的结构化数据实例（模块内共享，只读）"""
+    return StructuredData(fields={"field1": sample_field}, coverage=90.0)
+
+
+@pytest.fixture(scope="module")
+def sample_ocr():
+    """已校验的OCR结果实例（模块内共享，只读）"""
+    return OCRResult(
+        text="识别文本",
+        confidence=95.0,
+        language="zh",
+        engine="pytesseract"
+    )
+
 
 class TestFieldConfidence:
     """FieldConfidence 模型测试"""
@@ -37,25 +63,14 @@ class TestFieldConfidence:
         assert field.source == "llm"  # 有默认值
         assert field.needs_validation is False  # 有默认值
     
-    def test_confidence_range(self):
+    @pytest.mark.parametrize("confidence,valid", RANGE_CASES)
+    def test_confidence_range(self, confidence, valid):
         """测试置信度范围验证"""
-        # 正常范围
-        field = FieldConfidence(value="test", confidence=50.0)
-        assert field.confidence == 50.0
-        
-        # 边界值
-        field_min = FieldConfidence(value="test", confidence=0.0)
-        assert field_min.confidence == 0.0
-        
-        field_max = FieldConfidence(value="test", confidence=100.0)
-        assert field_max.confidence == 100.0
-        
-        # 超出范围应该失败
-        with pytest.raises(ValidationError):
-            FieldConfidence(value="test", confidence=-1.0)
-        
-        with pytest.raises(ValidationError):
-            FieldConfidence(value="test", confidence=101.0)
+        if valid:
+            assert FieldConfidence(value="test", confidence=confidence).confidence == confidence
+        else:
+            with pytest.raises(ValidationError):
+                FieldConfidence(value="test", confidence=confidence)
 
 
 class TestStructuredData:
@@ -76,35 +91,19 @@ class TestStructuredData:
         assert data.coverage == 87.5
         assert len(data.validation_list) == 1
     
-    def test_empty_validation_list(self):
+    def test_empty_validation_list(self, sample_structured):
         """测试空的校验列表"""
-        fields = {
-            "field1": FieldConfidence(value="value1", confidence=90.0)
-        }
-        data = StructuredData(fields=fields, coverage=90.0)
-        assert data.validation_list == []
+        assert sample_structured.validation_list == []
     
-    def test_coverage_range(self):
+    @pytest.mark.parametrize("coverage,valid", RANGE_CASES)
+    def test_coverage_range(self, sample_field, coverage, valid):
         """测试覆盖率范围验证"""
-        fields = {"field1": FieldConfidence(value="value1", confidence=90.0)}
-        
-        # 正常范围
-        data = StructuredData(fields=fields, coverage=50.0)
-        assert data.coverage == 50.0
-        
-        # 边界值
-        data_min = StructuredData(fields=fields, coverage=0.0)
-        assert data_min.coverage == 0.0
-        
-        data_max = StructuredData(fields=fields, coverage=100.0)
-        assert data_max.coverage == 100.0
-        
-        # 超出范围应该失败
-        with pytest.raises(ValidationError):
-            StructuredData(fields=fields, coverage=-1.0)
-        
-        with pytest.raises(ValidationError):
-            StructuredData(fields=fields, coverage=101.0)
+        fields = {"field1": sample_field}
+        if valid:
+            assert StructuredData(fields=fields, coverage=coverage).coverage == coverage
+        else:
+            with pytest.raises(ValidationError):
+                StructuredData(fields=fields, coverage=coverage)
 
 
 class TestOCRResult:
@@ -136,46 +135,25 @@ class TestOCRResult:
         assert result.text_blocks is None
         assert result.image_size is None
     
-    def test_confidence_range(self):
+    @pytest.mark.parametrize("confidence,valid", RANGE_CASES)
+    def test_confidence_range(self, confidence, valid):
         """测试置信度范围验证"""
-        # 正常范围
-        result = OCRResult(
-            text="test",
-            confidence=50.0,
-            language="en",
-            engine="pytesseract"
-        )
-        assert result.confidence == 50.0
-        
-        # 超出范围应该失败
-        with pytest.raises(ValidationError):
-            OCRResult(
-                text="test",
-                confidence=101.0,
-                language="en",
-                engine="pytesseract"
-            )
+        if valid:
+            result = OCRResult(text="test", confidence=confidence, language="en", engine="pytesseract")
+            assert result.confidence == confidence
+        else:
+            with pytest.raises(ValidationError):
+                OCRResult(text="test", confidence=confidence, language="en", engine="pytesseract")
 
 
 class TestProcessingResult:
     """ProcessingResult 模型测试"""
     
-    def test_valid_processing_result(self):
+    def test_valid_processing_result(self, sample_structured, sample_ocr):
         """测试有效的处理结果"""
-        structured_data = StructuredData(
-            fields={"field1": FieldConfidence(value="value1", confidence=90.0)},
-            coverage=90.0
-        )
-        ocr_result = OCRResult(
-            text="识别文本",
-            confidence=95.0,
-            language="zh",
-            engine="pytesseract"
-        )
-        
         result = ProcessingResult(
-            structured_data=structured_data,
-            ocr_result=ocr_result,
+            structured_data=sample_structured,
+            ocr_result=sample_ocr,
             cleaned_text="清理后的文本",
             structure_config="发票"
         )
@@ -183,26 +161,15 @@ class TestProcessingResult:
         assert result.ocr_result.text == "识别文本"
         assert result.cleaned_text == "清理后的文本"
     
-    def test_processing_result_with_optional_fields(self):
+    def test_processing_result_with_optional_fields(self, sample_structured, sample_ocr):
         """测试带可选字段的处理结果"""
-        structured_data = StructuredData(
-            fields={"field1": FieldConfidence(value="value1", confidence=90.0)},
-            coverage=90.0
-        )
-        ocr_result = OCRResult(
-            text="识别文本",
-            confidence=95.0,
-            language="zh",
-            engine="pytesseract"
-        )
-        
         entities = {
             "dates": [{"text": "2024-01-15", "start": 0, "end": 10}]
         }
         
         result = ProcessingResult(
-            structured_data=structured_data,
-            ocr_result=ocr_result,
+            structured_data=sample_structured,
+            ocr_result=sample_ocr,
             cleaned_text="清理后的文本",
             structure_config="发票",
             entities=entities,
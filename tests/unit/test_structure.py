@@ -8,10 +8,14 @@ from pathlib import Path
 
 from structure import (
     structure_ocr_result,
+    structure_ocr_batch,
     _clean_text,
     _load_nlp_config,
     _load_structure_config,
-    _calculate_field_confidence
+    _calculate_field_confidence,
+    _field_items,
+    _field_entity_type,
+    _find_values_in_text
 )
 
 
@@ -26,6 +30,25 @@ class TestCleanText:
         assert "     " not in cleaned
         assert "  " not in cleaned
     
+    @pytest.mark.parametrize("text, expected", [
+        ("a b\tc", "a b c"),
+        ("a \t  b\t\tc", "a b c"),
+        ("a  \n  b", "a \n b"),
+        ("单个 空格", "单个 空格"),
+    ])
+    def test_clean_text_remove_extra_spaces_exact(self, text, expected):
+        """测试连续空格/制表符折叠为单个空格，换行保留"""
+        assert _clean_text(text, {"remove_extra_spaces": True}) == expected
+    
+    def test_clean_text_remove_extra_spaces_long_ascii(self):
+        """测试长 ASCII 文本走 numpy 折叠路径，结果与正则一致"""
+        from structure import _RE_SPACES, _ASCII_SPACES_MIN_LEN
+        line = "  Invoice  INV-2024-001\tdate \t 2024-01-15   total 1,234.56 \n"
+        text = line * (_ASCII_SPACES_MIN_LEN // len(line) + 1)
+        cleaned = _clean_text(text, {"remove_extra_spaces": True})
+        assert cleaned == _RE_SPACES.sub(" ", text).strip()
+        assert "  " not in cleaned and "\t" not in cleaned
+    
     def test_clean_text_normalize_whitespace(self):
         """测试规范化空白字符"""
         text = "这是\r\n一段\r文本\n\n\n多行文本"
@@ -35,6 +58,12 @@ class TestCleanText:
         assert "\r" not in cleaned
         assert "\n\n\n" not in cleaned
     
+    def test_clean_text_normalize_whitespace_keeps_one_blank_line(self):
+        """测试规范化后保留单个空行，不改动行内制表符"""
+        text = "a\r\n\r\r\nb\tc\n\n\n\nd\r"
+        config = {"normalize_whitespace": True}
+        assert _clean_text(text, config) == "a\n\nb\tc\n\nd"
+    
     def test_clean_text_remove_special_chars(self):
         """测试移除特殊字符"""
         text = "这是@#$%^&*()特殊字符文本"
@@ -43,6 +72,12 @@ class TestCleanText:
         # 应该保留中文、英文、数字和基本标点
         assert "这是" in cleaned or "特殊字符文本" in cleaned
     
+    def test_clean_text_remove_special_chars_ascii(self):
+        """测试纯 ASCII 文本删除特殊字符（translate 快速路径）"""
+        text = "Invoice #INV-001 @ $1,234.56 (paid) 100%"
+        config = {"remove_special_chars": True}
+        assert _clean_text(text, config) == "Invoice INV001  123456 paid 100%"
+    
     def test_clean_text_no_cleaning(self):
         """测试不进行清理"""
         text = "原始文本  未清理"
@@ -61,6 +96,16 @@ class TestCleanText:
         cleaned = _clean_text(text, config)
         assert "     " not in cleaned
         assert "\r\n" not in cleaned
+    
+    def test_clean_text_cached_for_same_text_and_options(self):
+        """测试相同文本与清理选项命中缓存，选项不同时分别计算"""
+        from structure import _clean_text_cached
+        text = "缓存  测试\r\n文本"
+        _clean_text(text, {"remove_extra_spaces": True})
+        hits = _clean_text_cached.cache_info().hits
+        assert _clean_text("".join(text), {"remove_extra_spaces": True, "remove_special_chars": False}) == "缓存 测试\r\n文本"
+        assert _clean_text_cached.cache_info().hits == hits + 1
+        assert _clean_text(text, {"normalize_whitespace": True}) == "缓存  测试\n文本"
 
 
 class TestLoadNLPConfig:
@@ -114,6 +159,32 @@ class TestLoadStructureConfig:
         assert result["title"] == "测试配置"
         assert len(result["items"]) == 1
     
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_load_structure_config_json_backends(self, orjson_available, temp_dir, monkeypatch):
+        """测试 orjson 与标准库 json 两种解析实现"""
+        import structure_config
+        if orjson_available and not structure_config.ORJSON_AVAILABLE:
+            pytest.skip("orjson 未安装")
+        monkeypatch.setattr("structure_config.ORJSON_AVAILABLE", orjson_available)
+        
+        config_file = temp_dir / "structure.json"
+        config_data = {"title": "测试配置", "items": [{"field": "发票号码", "pattern": "INV-\\d+"}]}
+        config_file.write_text(json.dumps(config_data, ensure_ascii=False), encoding="utf-8")
+        
+        assert _load_structure_config(str(config_file)) == config_data
+    
+    def test_load_structure_config_reloads_after_change(self, temp_dir):
+        """测试配置文件修改后缓存失效"""
+        import os
+        config_file = temp_dir / "structure.json"
+        config_file.write_text(json.dumps({"title": "旧配置", "items": []}), encoding="utf-8")
+        assert _load_structure_config(str(config_file))["title"] == "旧配置"
+        
+        config_file.write_text(json.dumps({"title": "新配置", "items": []}), encoding="utf-8")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert _load_structure_config(str(config_file))["title"] == "新配置"
+    
     def test_load_structure_config_file_not_found(self, temp_dir):
         """测试配置文件不存在时抛出异常"""
         config_file = temp_dir / "nonexistent.json"
@@ -131,7 +202,7 @@ class TestCalculateFieldConfidence:
             field_name="测试字段",
             ocr_text="测试文本",
             ocr_result={"confidence": 90.0},
-            structure_config={"items": []},
+            pattern="",
             entities={}
         )
         assert result.confidence == 0.0
@@ -144,7 +215,7 @@ class TestCalculateFieldConfidence:
             field_name="测试字段",
             ocr_text="这是一段包含测试值的文本",
             ocr_result={"confidence": 90.0},
-            structure_config={"items": []},
+            pattern="",
             entities={}
         )
         assert result.confidence > 0.0
@@ -157,7 +228,7 @@ class TestCalculateFieldConfidence:
             field_name="日期",
             ocr_text="日期：2024-01-15",
             ocr_result={"confidence": 90.0},
-            structure_config={"items": []},
+            pattern="",
             entities={"dates": [{"text": "2024-01-15"}]}
         )
         assert result.confidence > 0.0
@@ -170,7 +241,7 @@ class TestCalculateFieldConfidence:
             field_name="金额",
             ocr_text="金额：1234.56",
             ocr_result={"confidence": 90.0},
-            structure_config={"items": []},
+            pattern="",
             entities={"amounts": [{"text": "1234.56"}]}
         )
         assert result.confidence > 0.0
@@ -182,21 +253,88 @@ class TestCalculateFieldConfidence:
             field_name="发票号码",
             ocr_text="发票号码：INV-2024-001",
             ocr_result={"confidence": 90.0},
-            structure_config={
-                "items": [
-                    {"field": "发票号码", "pattern": r"INV-\d+"}
-                ]
-            },
+            pattern=r"INV-\d+",
             entities={}
         )
         assert result.confidence > 0.0
         assert result.source in ["regex", "llm", "nlp"]
+    
+    def test_calculate_confidence_invalid_pattern(self):
+        """测试非法正则被忽略且只编译一次"""
+        from structure import _compile_pattern
+        kwargs = dict(
+            field_value="INV-2024-001",
+            field_name="发票号码",
+            ocr_text="发票号码：INV-2024-001",
+            ocr_result={"confidence": 90.0},
+            pattern=r"INV-(\d+",
+            entities={}
+        )
+        first = _calculate_field_confidence(**kwargs)
+        misses = _compile_pattern.cache_info().misses
+        second = _calculate_field_confidence(**kwargs)
+        assert first.source == second.source == "llm"
+        assert first.confidence == second.confidence
+        assert _compile_pattern.cache_info().misses == misses
+
+
+class TestFieldItems:
+    """_field_items 函数测试"""
+    
+    def test_field_items(self, mock_structure_config_dict):
+        """测试从配置中提取字段名和正则"""
+        assert _field_items(mock_structure_config_dict) == [
+            ("发票号码", "INV-\\d+"),
+            ("日期", ""),
+            ("金额", ""),
+        ]
+    
+    def test_field_items_empty_config(self):
+        """测试无字段配置"""
+        assert _field_items({}) == []
+
+
+class TestFieldEntityType:
+    """_field_entity_type 函数测试"""
+    
+    @pytest.mark.parametrize("field_name, expected", [
+        ("开票日期", "dates"),
+        ("Invoice Date", "dates"),
+        ("价税合计", "amounts"),
+        ("Total Amount", "amounts"),
+        ("联系电话", "phone_numbers"),
+        ("发票号码", None),
+    ])
+    def test_field_entity_type(self, field_name, expected):
+        """测试根据字段名判断实体类型"""
+        assert _field_entity_type(field_name) == expected
+
+
+class TestFindValuesInText:
+    """_find_values_in_text 函数测试"""
+    
+    @pytest.mark.parametrize("ahocorasick_available", [True, False])
+    def test_find_values_in_text(self, ahocorasick_available, monkeypatch):
+        """测试一次扫描找出文本中出现的字段值"""
+        import structure
+        if ahocorasick_available and not structure.AHOCORASICK_AVAILABLE:
+            pytest.skip("pyahocorasick 未安装")
+        monkeypatch.setattr("structure.AHOCORASICK_AVAILABLE", ahocorasick_available)
+        
+        text = "发票号码：INV-2024-001\n日期：2024-01-15"
+        values = ["INV-2024-001", "2024-01-15", "9999", ""] + [f"未出现{i}" for i in range(structure._AC_MIN_VALUES)]
+        matched = _find_values_in_text(values, text)
+        assert matched == {"INV-2024-001", "2024-01-15"}
+    
+    def test_find_values_in_empty_text(self):
+        """测试空文本"""
+        assert _find_values_in_text(["INV-2024-001"], "") == set()
 
 
 class TestStructureOCRResult:
     """structure_ocr_result 函数测试"""
     
-    @patch('structure.LLMService')
+    @patch('structure.get_llm_service')
     @patch('structure.get_entity_recognizer')
     def test_structure_ocr_result_basic(self, mock_get_recognizer, mock_llm_service, temp_dir, mock_structure_config):
         """测试基本的结构化处理"""
@@ -233,7 +371,32 @@ class TestStructureOCRResult:
         assert "cleaned_text" in result
         assert result["structured_data"]["coverage"] >= 0.0
     
-    @patch('structure.LLMService')
+    @patch('structure.get_llm_service')
+    @patch('structure.get_entity_recognizer')
+    def test_structure_ocr_result_llm_and_ner_run_concurrently(self, mock_get_recognizer, mock_llm_service, mock_structure_config):
+        """测试LLM提取与实体识别并发执行（串行执行时 Barrier 会超时）"""
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def extract_entities(text):
+            barrier.wait()
+            return {"dates": [{"text": "2024-01-15"}]}
+        
+        def improve_json_structure(**kwargs):
+            barrier.wait()
+            return {"发票号码": "INV-2024-001", "日期": "2024-01-15", "金额": None}
+        
+        mock_get_recognizer.return_value.extract_entities.side_effect = extract_entities
+        mock_llm_service.return_value.improve_json_structure.side_effect = improve_json_structure
+        
+        ocr_result = {"text": "发票号码：INV-2024-001\n日期：2024-01-15", "confidence": 95.0}
+        result = structure_ocr_result(ocr_result, str(mock_structure_config))
+        
+        assert result["entities"] == {"dates": [{"text": "2024-01-15"}]}
+        assert result["structured_data"]["fields"]["发票号码"]["value"] == "INV-2024-001"
+        assert result["structured_data"]["fields"]["日期"]["source"] == "nlp"
+    
+    @patch('structure.get_llm_service')
     @patch('structure.get_entity_recognizer')
     def test_structure_ocr_result_empty_text(self, mock_get_recognizer, mock_llm_service, temp_dir, mock_structure_config):
         """测试空文本的结构化处理"""
@@ -251,7 +414,7 @@ class TestStructureOCRResult:
         assert result["structured_data"]["coverage"] == 0.0
         assert len(result["structured_data"]["validation_list"]) > 0
     
-    @patch('structure.LLMService')
+    @patch('structure.get_llm_service')
     @patch('structure.get_entity_recognizer')
     def test_structure_ocr_result_nlp_disabled(self, mock_get_recognizer, mock_llm_service, temp_dir, monkeypatch):
         """测试NLP处理被禁用的情况"""
@@ -275,7 +438,7 @@ class TestStructureOCRResult:
         assert result["structured_data"] is None
         assert "raw_ocr" in result
     
-    @patch('structure.LLMService')
+    @patch('structure.get_llm_service')
     @patch('structure.get_entity_recognizer')
     def test_structure_ocr_result_llm_failure(self, mock_get_recognizer, mock_llm_service, temp_dir, mock_structure_config):
         """测试LLM处理失败的情况"""
@@ -298,7 +461,7 @@ class TestStructureOCRResult:
         assert "structured_data" in result
         assert result["structured_data"]["coverage"] == 0.0
     
-    @patch('structure.LLMService')
+    @patch('structure.get_llm_service')
     @patch('structure.get_entity_recognizer')
     def test_structure_ocr_result_entity_recognition_failure(self, mock_get_recognizer, mock_llm_service, temp_dir, mock_structure_config):
         """测试实体识别失败的情况"""
@@ -341,3 +504,81 @@ class TestStructureOCRResult:
         with pytest.raises(ValueError, match="未提供结构化配置文件路径"):
             structure_ocr_result(ocr_result)
 
+
+class TestStructureOCRBatch:
+    """structure_ocr_batch 函数测试"""
+    
+    @patch('structure.get_llm_service')
+    @patch('structure.get_entity_recognizer')
+    def test_structure_ocr_batch_single_llm_call(self, mock_get_recognizer, mock_get_llm, mock_structure_config):
+        """测试多页文本合并为一次LLM请求"""
+        mock_get_recognizer.return_value.extract_entities.return_value = {}
+        mock_llm = Mock()
+        mock_llm.max_batch_pages.return_value = None
+        mock_llm.improve_json_structure_batch.return_value = [
+            {"发票号码": "INV-2024-001", "日期": "2024-01-15", "金额": None},
+            {"发票号码": "INV-2024-002", "日期": None, "金额": None},
+        ]
+        mock_get_llm.return_value = mock_llm
+        
+        ocr_results = [
+            {"text": "发票号码：INV-2024-001\n日期：2024-01-15", "confidence": 95.0},
+            {"text": "", "confidence": 0.0},
+            {"text": "发票号码：INV-2024-002", "confidence": 95.0},
+        ]
+        
+        results = structure_ocr_batch(ocr_results, str(mock_structure_config))
+        
+        assert len(results) == 3
+        mock_llm.improve_json_structure_batch.assert_called_once()
+        mock_llm.improve_json_structure.assert_not_called()
+        assert results[0]["structured_data"]["fields"]["发票号码"]["value"] == "INV-2024-001"
+        assert results[1]["structured_data"]["coverage"] == 0.0
+        assert results[2]["structured_data"]["fields"]["发票号码"]["value"] == "INV-2024-002"
+    
+    @patch('structure.get_llm_service')
+    @patch('structure.get_entity_recognizer')
+    def test_structure_ocr_batch_falls_back_per_page(self, mock_get_recognizer, mock_get_llm, mock_structure_config):
+        """测试批量请求失败时逐页回退"""
+        mock_get_recognizer.return_value.extract_entities.return_value = {}
+        mock_llm = Mock()
+        mock_llm.max_batch_pages.return_value = None
+        mock_llm.improve_json_structure_batch.side_effect = ValueError("返回格式不符")
+        mock_llm.improve_json_structure.return_value = {"发票号码": "INV-2024-001"}
+        mock_get_llm.return_value = mock_llm
+        
+        ocr_results = [
+            {"text": "发票号码：INV-2024-001", "confidence": 95.0},
+            {"text": "发票号码：INV-2024-001", "confidence": 95.0},
+        ]
+        
+        results = structure_ocr_batch(ocr_results, str(mock_structure_config))
+        
+        assert mock_llm.improve_json_structure.call_count == 2
+        assert all(r["structured_data"]["fields"]["发票号码"]["value"] == "INV-2024-001" for r in results)
+    
+    @patch('structure.get_llm_service')
+    @patch('structure.get_entity_recognizer')
+    def test_structure_ocr_batch_respects_llm_page_limit(self, mock_get_recognizer, mock_get_llm, mock_structure_config):
+        """测试批大小受LLM输出预算限制，并把每页OCR结果传给批量请求"""
+        mock_get_recognizer.return_value.extract_entities.return_value = {}
+        mock_llm = Mock()
+        mock_llm.max_batch_pages.return_value = 2
+        mock_llm.improve_json_structure_batch.side_effect = lambda texts, config, ocr_results: [
+            {"发票号码": text.split("：")[1]} for text in texts
+        ]
+        mock_llm.improve_json_structure.return_value = {"发票号码": "INV-2024-003"}
+        mock_get_llm.return_value = mock_llm
+        
+        ocr_results = [
+            {"text": f"发票号码：INV-2024-00{i}", "confidence": 95.0, "text_blocks": []} for i in range(1, 4)
+        ]
+        
+        results = structure_ocr_batch(ocr_results, str(mock_structure_config), batch_size=10)
+        
+        mock_llm.improve_json_structure_batch.assert_called_once()
+        assert mock_llm.improve_json_structure_batch.call_args.args[2] == ocr_results[:2]
+        mock_llm.improve_json_structure.assert_called_once()
+        assert [r["structured_data"]["fields"]["发票号码"]["value"] for r in results] == [
+            "INV-2024-001", "INV-2024-002", "INV-2024-003"
+        ]
@@ -0,0 +1,80 @@
+"""
+结构化配置同步模块测试
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+import structure_config
+from structure_config import update_structure_config
+
+
+class TestUpdateStructureConfig:
+    """update_structure_config 函数测试"""
+    
+    @patch('llm.get_llm_service')
+    def test_update_keeps_successful_files_when_one_fails(self, mock_llm_service, temp_dir, monkeypatch):
+        """测试单个LLM调用失败时其余文件照常写入，失败文件不同步到 temp"""
+        monkeypatch.chdir(temp_dir)
+        for sub_dir in ("origin", "new", "temp"):
+            (temp_dir / "configs" / "structures" / sub_dir).mkdir(parents=True)
+        for name in ("ok.json", "bad.json"):
+            (temp_dir / "configs" / "structures" / "origin" / name).write_text(json.dumps({"name": name}), encoding="utf-8")
+        
+        def format_json_into_professional(json_str):
+            if "bad.json" in json_str:
+                raise RuntimeError("LLM 调用失败")
+            return {"title": "专业版"}
+        
+        mock_llm_service.return_value.format_json_into_professional.side_effect = format_json_into_professional
+        
+        update_structure_config(["bad.json", "ok.json"])
+        
+        structures_dir = temp_dir / "configs" / "structures"
+        assert json.loads((structures_dir / "new" / "ok.json").read_text(encoding="utf-8")) == {"title": "专业版"}
+        assert (structures_dir / "temp" / "ok.json").exists()
+        assert not (structures_dir / "new" / "bad.json").exists()
+        assert not (structures_dir / "temp" / "bad.json").exists()
+        sync_state = json.loads((structures_dir / ".sync_state.json").read_text(encoding="utf-8"))
+        assert set(sync_state) == {"ok.json"}
+
+
+class TestAtomicWriteText:
+    """_atomic_write_text 函数测试"""
+    
+    def test_keeps_existing_file_mode(self, temp_dir):
+        """测试覆盖已有文件时沿用原文件权限"""
+        path = temp_dir / "config.json"
+        path.write_text("{}", encoding="utf-8")
+        path.chmod(0o640)
+        
+        structure_config._atomic_write_text(str(path), '{"a": 1}')
+        
+        assert path.read_text(encoding="utf-8") == '{"a": 1}'
+        assert path.stat().st_mode & 0o777 == 0o640
+    
+    def test_new_file_mode_follows_umask(self, temp_dir):
+        """测试新建文件权限与 open(..., "w") 一致，遵循进程 umask"""
+        path = temp_dir / "config.json"
+        reference = temp_dir / "reference.json"
+        reference.write_text("{}", encoding="utf-8")
+        
+        structure_config._atomic_write_text(str(path), "{}")
+        
+        assert path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+    
+    def test_failed_write_removes_temp_file(self, temp_dir, monkeypatch):
+        """测试写入失败时删除临时文件，目标文件保持不变"""
+        path = temp_dir / "config.json"
+        path.write_text("{}", encoding="utf-8")
+        
+        def fail_replace(src, dst):
+            raise OSError("磁盘已满")
+        
+        monkeypatch.setattr(structure_config.os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            structure_config._atomic_write_text(str(path), '{"a": 1}')
+        
+        assert [p.name for p in temp_dir.iterdir()] == ["config.json"]
+        assert path.read_text(encoding="utf-8") == "{}"